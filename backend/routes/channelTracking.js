@@ -130,7 +130,8 @@ router.post('/', authenticateToken, async (req, res) => {
       channelUrl, 
       quality = 'best', 
       saveToLibrary = true,
-      scheduledHour = 2 
+      scheduledHour = 2,
+      allowRebalance = false
     } = req.body;
 
     // Validate required fields
@@ -164,7 +165,8 @@ router.post('/', authenticateToken, async (req, res) => {
     }
 
     // Extract channel ID and name
-    const youtubeChannelId = channelInfo.id || channelInfo.channel_id || channelInfo.uploader_id;
+    // Prefer the canonical UC... ID so subscriptions by handle and by ID match
+    const youtubeChannelId = channelInfo.channel_id || channelInfo.id || channelInfo.uploader_id;
     const channelName = channelInfo.channel || channelInfo.uploader || channelInfo.title || 'Canal Desconhecido';
 
     if (!youtubeChannelId) {
@@ -174,9 +176,9 @@ router.post('/', authenticateToken, async (req, res) => {
       });
     }
 
-    // Check if channel is already being tracked
+    // Check if channel is already being tracked by this user
     const existingTracking = await ChannelTracking.findOne({
-      where: { youtubeChannelId }
+      where: { youtubeChannelId, userId }
     });
 
     if (existingTracking) {
@@ -229,6 +231,7 @@ router.post('/', authenticateToken, async (req, res) => {
       quality,
       saveToLibrary,
       scheduledHour,
+      allowRebalance,
       metadata: {
         description: channelInfo.description,
         subscriber_count: channelInfo.subscriber_count,
@@ -289,7 +292,7 @@ router.put('/:id', authenticateToken, async (req, res) => {
   try {
     const userId = req.user.id;
     const trackingId = req.params.id;
-    const { quality, saveToLibrary, scheduledHour, isActive } = req.body;
+    const { quality, saveToLibrary, scheduledHour, isActive, allowRebalance } = req.body;
 
     const tracking = await ChannelTracking.findOne({
       where: { 
@@ -317,6 +320,7 @@ router.put('/:id', authenticateToken, async (req, res) => {
       }
       tracking.scheduledHour = scheduledHour;
     }
+    if (allowRebalance !== undefined) tracking.allowRebalance = allowRebalance;
     if (isActive !== undefined) {
       tracking.isActive = isActive;
       // Reset errors when reactivating
@@ -6,6 +6,9 @@ const { Video } = require('../models');
 
 const execPromise = util.promisify(exec);
 
+// IDs de vídeo do YouTube: 11 caracteres base64url
+const YOUTUBE_VIDEO_ID_PATTERN = /^[A-Za-z0-9_-]{11}$/;
+
 class YtdlpService {
   constructor() {
     this.downloadsPath = path.join(__dirname, '..', '..', 'videos', 'downloads');
@@ -665,6 +668,75 @@ class YtdlpService {
     };
   }
 
+  // Extrai o ID do vídeo de uma URL do YouTube (watch?v=, youtu.be, shorts, embed, live)
+  extractVideoId(url) {
+    let parsed;
+    try {
+      parsed = new URL(url);
+    } catch (error) {
+      return null;
+    }
+
+    const host = parsed.hostname.replace(/^(www\.|m\.|music\.)/, '');
+    let videoId = null;
+
+    if (host === 'youtu.be') {
+      videoId = parsed.pathname.split('/')[1];
+    } else if (host === 'youtube.com') {
+      const pathMatch = parsed.pathname.match(/^\/(shorts|embed|live)\/([^/]+)/);
+      videoId = parsed.searchParams.get('v') || (pathMatch && pathMatch[2]);
+    }
+
+    return YOUTUBE_VIDEO_ID_PATTERN.test(videoId || '') ? videoId : null;
+  }
+
+  // Normaliza metadados já extraídos pelo cliente para o formato de formatVideoMetadata.
+  // O youtubeId vira nome de arquivo dentro do comando yt-dlp, então só é aceito
+  // se for um ID válido e igual ao da URL; caso contrário retorna null.
+  normalizeProvidedMetadata(provided, url) {
+    if (!provided || typeof provided.title !== 'string' || !provided.title) {
+      return null;
+    }
+
+    if (!YOUTUBE_VIDEO_ID_PATTERN.test(provided.youtubeId || '') || provided.youtubeId !== this.extractVideoId(url)) {
+      return null;
+    }
+
+    return {
+      youtubeId: provided.youtubeId,
+      title: provided.title || 'Vídeo sem título',
+      description: provided.description || '',
+      duration: provided.duration || 0,
+      thumbnail: provided.thumbnail || '',
+      originalUrl: provided.originalUrl || '',
+      channelId: provided.channelId,
+      channelName: provided.channelName || 'Canal Desconhecido',
+      uploadDate: provided.uploadDate,
+      viewCount: provided.viewCount || 0,
+      likeCount: provided.likeCount || 0,
+      tags: Array.isArray(provided.tags) ? provided.tags : [],
+      categories: Array.isArray(provided.categories) ? provided.categories : [],
+      resolution: provided.resolution || 'unknown',
+      format: provided.format || 'mp4',
+      availableQualities: []
+    };
+  }
+
+  // Completa metadados fornecidos pelo cliente com o .info.json gravado no download
+  async completeMetadataFromInfoJson(metadata, infoPath) {
+    if (!infoPath || !await fs.pathExists(infoPath)) {
+      return metadata;
+    }
+
+    try {
+      const info = await fs.readJson(infoPath);
+      return { ...metadata, ...this.formatVideoMetadata(info) };
+    } catch (error) {
+      console.warn('⚠️ Não foi possível ler o info.json:', error.message);
+      return metadata;
+    }
+  }
+
   // Extrai opções de qualidade disponíveis
   extractQualityOptions(formats) {
     const qualities = new Set();
@@ -710,8 +782,10 @@ class YtdlpService {
 
   // Baixa vídeo único com callback de progresso usando comando direto
   async downloadVideo(url, options = {}, progressCallback = null) {
-    const info = await this.getInfo(url);
-    const metadata = this.formatVideoMetadata(info);
+    // Metadados já extraídos (options.metadata) evitam uma segunda extração;
+    // o youtubeId entra no comando, então só vale um ID válido
+    const providedMetadata = !!options.metadata && YOUTUBE_VIDEO_ID_PATTERN.test(options.metadata.youtubeId || '');
+    let metadata = providedMetadata ? options.metadata : this.formatVideoMetadata(await this.getInfo(url));
     
     if (!metadata) {
       throw new Error('Não foi possível formatar metadados do vídeo');
@@ -771,6 +845,10 @@ class YtdlpService {
             
             console.log(`🖼️ Thumbnail detectada: ${thumbnailPath ? path.basename(thumbnailPath) : 'Não encontrada'}`);
             
+            if (providedMetadata) {
+              metadata = await this.completeMetadataFromInfoJson(metadata, infoPath);
+            }
+            
             resolve({
               metadata,
               filePath: outputPath,
@@ -807,6 +885,10 @@ class YtdlpService {
       
       console.log(`🖼️ Thumbnail detectada: ${thumbnailPath ? path.basename(thumbnailPath) : 'Não encontrada'}`);
       
+      if (providedMetadata) {
+        metadata = await this.completeMetadataFromInfoJson(metadata, infoPath);
+      }
+      
       return {
         metadata,
         filePath: outputPath,
@@ -0,0 +1,216 @@
+"""
+Adaptive Concurrency Module for XandTube Channel Tracking Jobs
+AIMD controllers that size yt-dlp and backend API concurrency from observed latency and errors
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from config import config
+from trace_recorder import recorder
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+OUTCOME_OK = 'ok'
+OUTCOME_ERROR = 'error'
+OUTCOME_TIMEOUT = 'timeout'
+
+class AdaptiveLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease"""
+
+    def __init__(self, name: str, initial: int, minimum: int, maximum: int, target_latency: float):
+        """
+        Args:
+            name (str): Name used in logs and metrics
+            initial (int): Starting concurrency
+            minimum (int): Lowest concurrency the controller may choose
+            maximum (int): Highest concurrency the controller may choose
+            target_latency (float): 90th percentile latency in seconds above which
+                concurrency is reduced
+        """
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency = target_latency
+        self.condition = threading.Condition()
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.window: List[tuple] = []
+        self.decisions = deque(maxlen=20)
+        self.totals = {OUTCOME_OK: 0, OUTCOME_ERROR: 0, OUTCOME_TIMEOUT: 0}
+        self.increases = 0
+        self.decreases = 0
+
+    def current_limit(self) -> int:
+        """Current concurrency limit as a whole number of workers"""
+        with self.condition:
+            return int(self.limit)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until fewer operations than the current limit are running
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for a slot
+
+        Returns:
+            bool: True if a slot was taken, False if the wait timed out
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return True
+
+    def release(self, latency: float, outcome: str = OUTCOME_OK):
+        """
+        Finish an operation and feed its result to the controller
+
+        Args:
+            latency (float): Seconds the operation took
+            outcome (str): OUTCOME_OK, OUTCOME_ERROR or OUTCOME_TIMEOUT
+        """
+        with self.condition:
+            self.in_flight -= 1
+            self.totals[outcome] += 1
+            self.window.append((latency, outcome))
+
+            if len(self.window) >= config.ADAPTIVE_WINDOW_SIZE:
+                self.adjust()
+
+            self.condition.notify_all()
+
+    def adjust(self):
+        """Decide on a new limit from the samples of the last window (lock held)"""
+        samples = len(self.window)
+        timeouts = sum(1 for _, outcome in self.window if outcome == OUTCOME_TIMEOUT)
+        errors = sum(1 for _, outcome in self.window if outcome == OUTCOME_ERROR)
+        latencies = sorted(latency for latency, _ in self.window)
+        p90_latency = latencies[min(samples - 1, int(samples * 0.9))]
+        saturated = self.peak_in_flight >= int(self.limit)
+
+        self.window = []
+        self.peak_in_flight = self.in_flight
+
+        if not config.ADAPTIVE_CONCURRENCY_ENABLED:
+            return
+
+        old_limit = self.limit
+
+        if timeouts or (errors + timeouts) / samples > config.ADAPTIVE_ERROR_RATE_THRESHOLD:
+            self.limit = max(self.minimum, self.limit * config.ADAPTIVE_DECREASE_FACTOR)
+            reason = f"{errors} errors and {timeouts} timeouts in {samples} calls"
+        elif p90_latency > self.target_latency:
+            self.limit = max(self.minimum, self.limit * config.ADAPTIVE_DECREASE_FACTOR)
+            reason = f"p90 latency {p90_latency:.1f}s above target {self.target_latency:.1f}s"
+        elif saturated:
+            self.limit = min(self.maximum, self.limit + 1)
+            reason = f"all {int(old_limit)} slots busy, p90 latency {p90_latency:.1f}s"
+        else:
+            return
+
+        if int(self.limit) == int(old_limit):
+            return
+
+        if self.limit > old_limit:
+            self.increases += 1
+        else:
+            self.decreases += 1
+
+        self.decisions.append({
+            'time': time.time(),
+            'from': int(old_limit),
+            'to': int(self.limit),
+            'reason': reason
+        })
+        logger.info(f"🎚️ {self.name} concurrency {int(old_limit)} -> {int(self.limit)}: {reason}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the controller state for export
+
+        Returns:
+            Dict: Limit, bounds, in-flight count, outcome totals and recent decisions
+        """
+        with self.condition:
+            return {
+                'name': self.name,
+                'limit': int(self.limit),
+                'minimum': self.minimum,
+                'maximum': self.maximum,
+                'in_flight': self.in_flight,
+                'totals': dict(self.totals),
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'decisions': list(self.decisions)
+            }
+
+# Process-wide controllers: every tracker shares the same upstream and backend
+ytdlp_limiter = AdaptiveLimiter(
+    'ytdlp',
+    config.METADATA_FETCH_WORKERS,
+    config.YTDLP_CONCURRENCY_MIN,
+    config.YTDLP_CONCURRENCY_MAX,
+    config.YTDLP_TARGET_LATENCY_SECONDS
+)
+api_limiter = AdaptiveLimiter(
+    'api',
+    config.API_CONCURRENCY_INITIAL,
+    config.API_CONCURRENCY_MIN,
+    config.API_CONCURRENCY_MAX,
+    config.API_TARGET_LATENCY_SECONDS
+)
+limiters = [ytdlp_limiter, api_limiter]
+
+def call_api(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a backend API request within the adaptive API concurrency limit
+
+    Server errors, throttling and connection failures count as errors;
+    requests timeouts count as timeouts.
+
+    Args:
+        session (requests.Session): HTTP session used to reach the backend API
+        method (str): HTTP method
+        url (str): Request URL
+        **kwargs: Passed on to requests
+
+    Returns:
+        requests.Response: Backend response
+    """
+    api_limiter.acquire()
+    started_at = time.monotonic()
+    outcome = OUTCOME_ERROR
+    response = None
+
+    try:
+        response = session.request(method, url, **kwargs)
+        if response.status_code < 500 and response.status_code != 429:
+            outcome = OUTCOME_OK
+        return response
+
+    except requests.Timeout:
+        outcome = OUTCOME_TIMEOUT
+        raise
+
+    finally:
+        latency = time.monotonic() - started_at
+        api_limiter.release(latency, outcome)
+        recorder.record(
+            'api',
+            method=method.upper(),
+            path=url[len(config.API_BASE_URL):] if url.startswith(config.API_BASE_URL) else url,
+            status=response.status_code if response is not None else None,
+            body=response.text if response is not None else None,
+            latency=latency,
+            outcome=outcome
+        )
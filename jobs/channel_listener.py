@@ -0,0 +1,158 @@
+"""
+Channel Event Listener Module for XandTube Channel Tracking Jobs
+Listens for Postgres notifications about newly tracked channels and checks them immediately
+"""
+
+import logging
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Set
+
+import psycopg2
+
+from config import config
+from database import DatabaseManager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class ChannelEventListener:
+    """LISTENs for channel tracking notifications and dispatches debounced checks"""
+
+    def __init__(self, handler: Callable[[List[int]], None]):
+        """
+        Args:
+            handler (Callable): Called with a batch of channel tracking IDs to check
+        """
+        self.handler = handler
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.EVENT_MAX_CONCURRENT,
+            thread_name_prefix='channel-event'
+        )
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.lock = threading.Lock()
+        self.pending: Set[int] = set()
+        self.in_flight: Set[int] = set()
+        self.running_batches = 0
+        self.first_event_time = 0.0
+        self.last_event_time = 0.0
+
+    def start(self):
+        """Start listening in a daemon thread"""
+        self.thread = threading.Thread(target=self.listen_loop, name='channel-listener', daemon=True)
+        self.thread.start()
+        logger.info(f"👂 Listening for channel tracking notifications on '{config.EVENT_NOTIFY_CHANNEL}'")
+
+    def stop(self):
+        """Stop listening and wait for running checks to finish"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        self.executor.shutdown(wait=True)
+
+    def listen_loop(self):
+        """Keep a LISTEN connection open, reconnecting with backoff on errors"""
+        backoff = 1
+
+        while not self.stop_event.is_set():
+            db = DatabaseManager()
+
+            if not db.connect():
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60)
+                continue
+
+            try:
+                db.connection.autocommit = True
+                db.cursor.execute(f"LISTEN {config.EVENT_NOTIFY_CHANNEL}")
+                backoff = 1
+
+                while not self.stop_event.is_set():
+                    if select.select([db.connection], [], [], 1.0) != ([], [], []):
+                        db.connection.poll()
+                        self.collect_notifications(db.connection)
+                    self.dispatch_ready()
+
+            except (psycopg2.Error, OSError) as e:
+                logger.error(f"❌ Channel listener connection lost: {e}")
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60)
+
+            finally:
+                db.disconnect()
+
+    def collect_notifications(self, connection):
+        """
+        Add notified channel IDs to the pending set
+
+        Args:
+            connection: psycopg2 connection with received notifications
+        """
+        with self.lock:
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                try:
+                    channel_id = int(notify.payload)
+                except ValueError:
+                    logger.warning(f"⚠️ Ignoring malformed channel notification: {notify.payload!r}")
+                    continue
+
+                now = time.monotonic()
+                if not self.pending:
+                    self.first_event_time = now
+                self.pending.add(channel_id)
+                self.last_event_time = now
+
+    def dispatch_ready(self):
+        """
+        Submit pending channels once the debounce window has passed and capacity allows
+
+        A steady stream of notifications keeps resetting the quiet period, so a
+        batch is also dispatched EVENT_DEBOUNCE_MAX_WAIT_SECONDS after its first one.
+        """
+        with self.lock:
+            if not self.pending:
+                return
+
+            now = time.monotonic()
+            quiet = now - self.last_event_time >= config.EVENT_DEBOUNCE_SECONDS
+            waited_too_long = now - self.first_event_time >= config.EVENT_DEBOUNCE_MAX_WAIT_SECONDS
+            if not (quiet or waited_too_long):
+                return
+            if self.running_batches >= config.EVENT_MAX_CONCURRENT:
+                return
+
+            # Channels already being checked wait for the next batch
+            batch = sorted(self.pending - self.in_flight)
+            if not batch:
+                return
+
+            self.pending.difference_update(batch)
+            if self.pending:
+                # Left over for the next batch, which gets a max wait of its own
+                self.first_event_time = now
+            self.in_flight.update(batch)
+            self.running_batches += 1
+
+        logger.info(f"⚡ Dispatching immediate check for {len(batch)} channel(s)")
+        self.executor.submit(self.run_batch, batch)
+
+    def run_batch(self, channel_ids: List[int]):
+        """
+        Run the handler for a batch and release its capacity
+
+        Args:
+            channel_ids (List[int]): Channel tracking IDs to check
+        """
+        try:
+            self.handler(channel_ids)
+        except Exception as e:
+            logger.error(f"❌ Immediate channel check failed: {e}")
+        finally:
+            with self.lock:
+                self.in_flight.difference_update(channel_ids)
+                self.running_batches -= 1
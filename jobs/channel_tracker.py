@@ -1,425 +1,1310 @@
-"""
-Main Channel Tracking Job Module for XandTube
-Handles automatic discovery and downloading of new videos from tracked channels
-"""
-
-import os
-import sys
-import logging
-import subprocess
-import json
-import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-
-# Add the jobs directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from config import config
-from database import db_manager
-
-# Set up logging
-logging.basicConfig(
-    level=getattr(logging, config.LOG_LEVEL),
-    format=config.LOG_FORMAT,
-    handlers=[
-        logging.FileHandler(config.LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-logger = logging.getLogger(__name__)
-
-class ChannelTracker:
-    """Main class for tracking channels and downloading new videos"""
-    
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.timeout = config.API_TIMEOUT
-        
-    def format_date_for_ytdlp(self, date: datetime) -> str:
-        """
-        Format date for yt-dlp date filters
-        
-        Args:
-            date (datetime): Date to format
-            
-        Returns:
-            str: Date in YYYYMMDD format
-        """
-        return date.strftime('%Y%m%d')
-    
-    @retry(
-        stop=stop_after_attempt(config.MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((subprocess.TimeoutExpired, subprocess.CalledProcessError))
-    )
-    def get_channel_videos_in_date_range(self, channel_url: str, from_date: datetime, to_date: datetime) -> List[Dict[str, Any]]:
-        """
-        Get videos from a channel within a specific date range using yt-dlp
-        
-        Args:
-            channel_url (str): YouTube channel URL
-            from_date (datetime): Start date for search
-            to_date (datetime): End date for search
-            
-        Returns:
-            List[Dict]: List of video information
-        """
-        try:
-            from_date_str = self.format_date_for_ytdlp(from_date)
-            to_date_str = self.format_date_for_ytdlp(to_date)
-            
-            logger.info(f"🔍 Searching for videos in channel between {from_date_str} and {to_date_str}")
-            
-            # Build yt-dlp command
-            cmd = [
-                config.YTDLP_COMMAND,
-                '--dump-json',
-                '--flat-playlist',
-                '--dateafter', from_date_str,
-                '--datebefore', to_date_str,
-                '--no-warnings',
-                '--playlist-end', str(config.MAX_VIDEOS_PER_CHECK),
-                channel_url
-            ]
-            
-            # Execute command
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=config.YTDLP_TIMEOUT,
-                check=True
-            )
-            
-            if not result.stdout.strip():
-                logger.info("ℹ️ No videos found in the specified date range")
-                return []
-            
-            # Parse JSON output
-            videos = []
-            lines = result.stdout.strip().split('\n')
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                    
-                try:
-                    video_data = json.loads(line)
-                    
-                    # Skip playlist metadata, only process video entries
-                    if video_data.get('_type') == 'playlist':
-                        continue
-                        
-                    if video_data.get('id'):
-                        videos.append({
-                            'id': video_data['id'],
-                            'title': video_data.get('title', f"Video {len(videos) + 1}"),
-                            'url': video_data.get('url', f"https://www.youtube.com/watch?v={video_data['id']}"),
-                            'upload_date': video_data.get('upload_date'),
-                            'duration': video_data.get('duration', 0),
-                            'thumbnail': video_data.get('thumbnail', ''),
-                            'description': video_data.get('description', ''),
-                            'view_count': video_data.get('view_count', 0),
-                            'uploader': video_data.get('uploader', ''),
-                            'channel_id': video_data.get('channel_id', ''),
-                            'webpage_url': video_data.get('webpage_url', '')
-                        })
-                        
-                except json.JSONDecodeError as e:
-                    logger.warning(f"⚠️ Failed to parse JSON line: {e}")
-                    continue
-            
-            logger.info(f"✅ Found {len(videos)} videos in date range")
-            return videos
-            
-        except subprocess.TimeoutExpired:
-            logger.error(f"⏰ yt-dlp command timed out after {config.YTDLP_TIMEOUT} seconds")
-            raise
-        except subprocess.CalledProcessError as e:
-            logger.error(f"❌ yt-dlp command failed: {e.stderr}")
-            raise
-        except Exception as e:
-            logger.error(f"❌ Unexpected error getting channel videos: {e}")
-            raise
-    
-    @retry(
-        stop=stop_after_attempt(config.MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
-    def download_video_via_api(self, video_url: str, user_id: str, quality: str = 'best') -> bool:
-        """
-        Download a video using the XandTube API
-        
-        Args:
-            video_url (str): YouTube video URL
-            user_id (str): User ID for the download
-            quality (str): Video quality preference
-            
-        Returns:
-            bool: True if download was initiated successfully
-        """
-        try:
-            # Get user token (this would need to be implemented)
-            # For now, we'll use a system token or bypass authentication
-            
-            download_data = {
-                'url': video_url,
-                'quality': quality,
-                'saveToLibrary': True
-            }
-            
-            # Make API request to start download
-            response = self.session.post(
-                f"{config.API_BASE_URL}/download/video",
-                json=download_data,
-                headers={
-                    'Content-Type': 'application/json',
-                    # 'Authorization': f'Bearer {user_token}'  # Would need user token
-                }
-            )
-            
-            if response.status_code in [200, 201]:
-                logger.info(f"✅ Download initiated successfully for video: {video_url}")
-                return True
-            else:
-                logger.error(f"❌ API request failed with status {response.status_code}: {response.text}")
-                return False
-                
-        except requests.RequestException as e:
-            logger.error(f"❌ API request failed: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"❌ Unexpected error downloading video: {e}")
-            raise
-    
-    def process_channel(self, channel_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Process a single channel: check for new videos and download them
-        
-        Args:
-            channel_data (Dict): Channel tracking information from database
-            
-        Returns:
-            Dict: Processing results and statistics
-        """
-        channel_id = channel_data['id']
-        channel_name = channel_data['channel_name']
-        channel_url = channel_data['channel_url']
-        user_id = channel_data['user_id']
-        quality = channel_data.get('quality', config.DEFAULT_QUALITY)
-        save_to_library = channel_data.get('save_to_library', True)
-        
-        logger.info(f"🎯 Processing channel: {channel_name}")
-        
-        results = {
-            'channel_id': channel_id,
-            'channel_name': channel_name,
-            'success': False,
-            'videos_found': 0,
-            'videos_downloaded': 0,
-            'videos_skipped': 0,
-            'error_message': None
-        }
-        
-        try:
-            # Calculate date range (yesterday)
-            now = datetime.now(config.TIMEZONE)
-            to_date = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-            from_date = to_date - timedelta(days=config.SEARCH_DAYS_BACK)
-            
-            logger.info(f"📅 Searching for videos from {from_date.date()} to {to_date.date()}")
-            
-            # Get videos from channel in date range
-            videos = self.get_channel_videos_in_date_range(channel_url, from_date, to_date)
-            results['videos_found'] = len(videos)
-            
-            if not videos:
-                logger.info(f"ℹ️ No new videos found for channel: {channel_name}")
-                results['success'] = True
-                return results
-            
-            # Process each video
-            for video in videos:
-                video_id = video['id']
-                video_title = video['title']
-                video_url = video['url']
-                
-                logger.info(f"📹 Processing video: {video_title}")
-                
-                # Check if video already exists for this user
-                if db_manager.check_video_exists(video_id, user_id):
-                    logger.info(f"⏭️ Video already exists, skipping: {video_title}")
-                    results['videos_skipped'] += 1
-                    continue
-                
-                # Download video if save_to_library is enabled
-                if save_to_library:
-                    try:
-                        if self.download_video_via_api(video_url, user_id, quality):
-                            results['videos_downloaded'] += 1
-                            db_manager.record_video_downloaded(channel_id)
-                            logger.info(f"✅ Video download initiated: {video_title}")
-                        else:
-                            logger.warning(f"⚠️ Failed to initiate download for: {video_title}")
-                    except Exception as e:
-                        logger.error(f"❌ Error downloading video {video_title}: {e}")
-                        continue
-                else:
-                    logger.info(f"ℹ️ Save to library disabled, skipping download: {video_title}")
-                    results['videos_skipped'] += 1
-            
-            # Record the videos found
-            if videos:
-                latest_video_id = videos[0]['id']  # Assuming first video is latest
-                db_manager.record_videos_found(channel_id, len(videos), latest_video_id)
-            
-            results['success'] = True
-            logger.info(f"✅ Channel processing completed: {channel_name} - Found: {results['videos_found']}, Downloaded: {results['videos_downloaded']}, Skipped: {results['videos_skipped']}")
-            
-        except Exception as e:
-            error_msg = f"Error processing channel {channel_name}: {str(e)}"
-            logger.error(f"❌ {error_msg}")
-            results['error_message'] = error_msg
-            results['success'] = False
-        
-        return results
-    
-    def run_tracking_job(self, hour: int) -> Dict[str, Any]:
-        """
-        Run the main tracking job for all channels scheduled at the specified hour
-        
-        Args:
-            hour (int): Hour of day to process (0-23)
-            
-        Returns:
-            Dict: Job execution summary
-        """
-        job_start_time = datetime.now(config.TIMEZONE)
-        logger.info(f"🚀 Starting channel tracking job for hour {hour} at {job_start_time}")
-        
-        job_results = {
-            'start_time': job_start_time,
-            'end_time': None,
-            'duration_seconds': 0,
-            'channels_processed': 0,
-            'channels_successful': 0,
-            'channels_failed': 0,
-            'total_videos_found': 0,
-            'total_videos_downloaded': 0,
-            'total_videos_skipped': 0,
-            'errors': []
-        }
-        
-        try:
-            # Connect to database
-            if not db_manager.connect():
-                raise Exception("Failed to connect to database")
-            
-            # Get active channels for this hour
-            channels = db_manager.get_active_channels_for_hour(hour)
-            
-            if not channels:
-                logger.info(f"ℹ️ No active channels found for hour {hour}")
-                return job_results
-            
-            logger.info(f"📋 Found {len(channels)} channels to process")
-            
-            # Process each channel
-            for channel in channels:
-                channel_id = channel['id']
-                channel_name = channel['channel_name']
-                
-                try:
-                    # Process the channel
-                    channel_results = self.process_channel(channel)
-                    
-                    # Update job statistics
-                    job_results['channels_processed'] += 1
-                    
-                    if channel_results['success']:
-                        job_results['channels_successful'] += 1
-                        job_results['total_videos_found'] += channel_results['videos_found']
-                        job_results['total_videos_downloaded'] += channel_results['videos_downloaded']
-                        job_results['total_videos_skipped'] += channel_results['videos_skipped']
-                        
-                        # Update channel last check timestamp
-                        db_manager.update_channel_last_check(channel_id)
-                        
-                    else:
-                        job_results['channels_failed'] += 1
-                        error_msg = channel_results.get('error_message', 'Unknown error')
-                        job_results['errors'].append(f"{channel_name}: {error_msg}")
-                        
-                        # Update channel with error
-                        db_manager.update_channel_last_check(channel_id, error_msg)
-                    
-                except Exception as e:
-                    error_msg = f"Failed to process channel {channel_name}: {str(e)}"
-                    logger.error(f"❌ {error_msg}")
-                    
-                    job_results['channels_processed'] += 1
-                    job_results['channels_failed'] += 1
-                    job_results['errors'].append(error_msg)
-                    
-                    # Update channel with error
-                    db_manager.update_channel_last_check(channel_id, error_msg)
-            
-        except Exception as e:
-            error_msg = f"Job execution failed: {str(e)}"
-            logger.error(f"❌ {error_msg}")
-            job_results['errors'].append(error_msg)
-            
-        finally:
-            # Clean up database connection
-            db_manager.disconnect()
-            
-            # Calculate job duration
-            job_results['end_time'] = datetime.now(config.TIMEZONE)
-            job_results['duration_seconds'] = (job_results['end_time'] - job_results['start_time']).total_seconds()
-            
-            # Log job summary
-            logger.info(f"🏁 Job completed in {job_results['duration_seconds']:.2f} seconds")
-            logger.info(f"📊 Channels: {job_results['channels_processed']} processed, {job_results['channels_successful']} successful, {job_results['channels_failed']} failed")
-            logger.info(f"📹 Videos: {job_results['total_videos_found']} found, {job_results['total_videos_downloaded']} downloaded, {job_results['total_videos_skipped']} skipped")
-            
-            if job_results['errors']:
-                logger.warning(f"⚠️ Errors occurred: {len(job_results['errors'])}")
-                for error in job_results['errors']:
-                    logger.warning(f"   - {error}")
-        
-        return job_results
-
-# Global tracker instance
-tracker = ChannelTracker()
-
-def main():
-    """Main entry point for manual execution"""
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='XandTube Channel Tracking Job')
-    parser.add_argument('--hour', type=int, help='Hour to process (0-23)', default=datetime.now().hour)
-    parser.add_argument('--test', action='store_true', help='Test mode - process all active channels regardless of hour')
-    
-    args = parser.parse_args()
-    
-    if args.test:
-        logger.info("🧪 Running in test mode - processing all active channels")
-        # In test mode, we could process all channels or use current hour
-        results = tracker.run_tracking_job(datetime.now().hour)
-    else:
-        results = tracker.run_tracking_job(args.hour)
-    
-    # Print results
-    print(f"\n📋 Job Summary:")
-    print(f"   Duration: {results['duration_seconds']:.2f} seconds")
-    print(f"   Channels processed: {results['channels_processed']}")
-    print(f"   Videos found: {results['total_videos_found']}")
-    print(f"   Videos downloaded: {results['total_videos_downloaded']}")
-    
-    if results['errors']:
-        print(f"   Errors: {len(results['errors'])}")
-
-if __name__ == '__main__':
+"""
+Main Channel Tracking Job Module for XandTube
+Handles automatic discovery and downloading of new videos from tracked channels
+"""
+
+import os
+import sys
+import logging
+import subprocess
+import re
+import signal
+import threading
+import time
+import requests
+from datetime import date, datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Dict, Optional, Any, Tuple
+from tenacity import retry, stop_after_attempt, stop_any, wait_exponential, retry_if_exception_type, retry_if_not_exception_type
+
+# Add the jobs directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import config
+from adaptive_limiter import OUTCOME_ERROR, OUTCOME_OK, OUTCOME_TIMEOUT, call_api, ytdlp_limiter
+from database import DatabaseManager, SynchronizedDatabase, db_manager
+from download_dispatcher import download_dispatcher
+from fair_queue import FairShareQueue
+from logging_setup import setup_logging
+from trace_recorder import recorder
+from rate_limiter import RateLimiter
+from ytdlp_parser import parse_listing, parse_video_metadata
+
+# Set up logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Canonical YouTube channel ID (UC followed by 22 base64url characters)
+CHANNEL_ID_PATTERN = re.compile(r'UC[0-9A-Za-z_-]{22}')
+
+class DeadlineExceeded(Exception):
+    """Raised when a channel's time budget or the run deadline is used up"""
+
+def deadline_reached(retry_state) -> bool:
+    """tenacity stop condition: stop retrying once the call's deadline has passed"""
+    deadline = retry_state.kwargs.get('deadline')
+    return deadline is not None and time.monotonic() >= deadline
+
+# Shared by every tracker in the process, scheduled runs and immediate checks
+# alike, so METADATA_FETCH_RATE and USER_DOWNLOADS_PER_MINUTE hold process-wide
+metadata_rate_limiter = RateLimiter(config.METADATA_FETCH_RATE, burst=config.METADATA_FETCH_WORKERS)
+user_download_limiters: Dict[str, RateLimiter] = {}
+user_download_limiters_lock = threading.Lock()
+
+class ChannelTracker:
+    """Main class for tracking channels and downloading new videos"""
+    
+    def __init__(self, db: Optional[DatabaseManager] = None):
+        # Trackers running outside the scheduled jobs use their own connection;
+        # channel workers of one tracker share it, one statement at a time
+        self.db = SynchronizedDatabase(db or db_manager)
+        self.session = requests.Session()
+        self.session.timeout = config.API_TIMEOUT
+        if config.API_TOKEN:
+            self.session.headers['Authorization'] = f"Bearer {config.API_TOKEN}"
+        
+        # Shared by all metadata fetches so parallel channels stay within budget
+        self.metadata_rate_limiter = metadata_rate_limiter
+        self.backfill_rate_limiter = RateLimiter(config.BACKFILL_LISTING_RATE, burst=config.BACKFILL_WORKERS)
+        
+        # Downloads submitted during the current run, keyed by YouTube video ID
+        self.run_downloads: Dict[str, Dict[str, Any]] = {}
+        self.job_results: Dict[str, Any] = {}
+        self.results_lock = threading.RLock()
+        
+        # Process-wide, so DOWNLOAD_QUEUE_DEPTH also covers immediate checks
+        self.dispatcher = download_dispatcher
+        
+        # Checkpointed tracking run in progress, if any
+        self.run_id: Optional[int] = None
+        
+        # time.monotonic() by which the current run must finish, and the yt-dlp
+        # processes it has running
+        self.run_deadline: Optional[float] = None
+        self.active_processes: set = set()
+        self.process_lock = threading.Lock()
+        
+    def format_date_for_ytdlp(self, date: datetime) -> str:
+        """
+        Format date for yt-dlp date filters
+        
+        Args:
+            date (datetime): Date to format
+            
+        Returns:
+            str: Date in YYYYMMDD format
+        """
+        return date.strftime('%Y%m%d')
+    
+    def run_ytdlp(self, args: List[str], deadline: Optional[float] = None) -> str:
+        """
+        Run yt-dlp and return its standard output
+        
+        Waits for a slot of the adaptive yt-dlp concurrency limit and reports
+        the call's latency and outcome back to it. yt-dlp runs in its own
+        process group, so helpers it spawns (e.g. ffmpeg) are killed with it
+        when the call times out.
+        
+        Args:
+            args (List[str]): yt-dlp arguments
+            deadline (float, optional): time.monotonic() by which the call must
+                finish, shortening YTDLP_TIMEOUT if needed
+            
+        Returns:
+            str: Command output
+        """
+        timeout = config.YTDLP_TIMEOUT
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+            if timeout <= 0 or not ytdlp_limiter.acquire(timeout):
+                raise DeadlineExceeded("Time budget used up before yt-dlp could start")
+            timeout = min(config.YTDLP_TIMEOUT, deadline - time.monotonic())
+        else:
+            ytdlp_limiter.acquire()
+        
+        started_at = time.monotonic()
+        outcome = OUTCOME_ERROR
+        stdout = None
+        
+        try:
+            process = subprocess.Popen(
+                [config.YTDLP_COMMAND, *args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                start_new_session=True
+            )
+            
+            with self.process_lock:
+                self.active_processes.add(process)
+            
+            try:
+                stdout, stderr = process.communicate(timeout=max(timeout, 0))
+                
+            except subprocess.TimeoutExpired:
+                outcome = OUTCOME_TIMEOUT
+                self.kill_process_group(process)
+                
+                if timeout < config.YTDLP_TIMEOUT:
+                    logger.error("⏰ yt-dlp command stopped after %.0f seconds: time budget used up", timeout)
+                    raise DeadlineExceeded("Time budget used up while yt-dlp was running")
+                
+                logger.error("⏰ yt-dlp command timed out after %s seconds", config.YTDLP_TIMEOUT)
+                raise
+                
+            finally:
+                with self.process_lock:
+                    self.active_processes.discard(process)
+            
+            if process.returncode != 0:
+                logger.error("❌ yt-dlp command failed: %s", stderr)
+                raise subprocess.CalledProcessError(process.returncode, process.args, stdout, stderr)
+            
+            outcome = OUTCOME_OK
+            return stdout
+            
+        finally:
+            latency = time.monotonic() - started_at
+            ytdlp_limiter.release(latency, outcome)
+            recorder.record('ytdlp', args=args, latency=latency, outcome=outcome, stdout=stdout)
+    
+    def kill_process_group(self, process: subprocess.Popen):
+        """
+        Stop a yt-dlp process together with every process it spawned
+        
+        Args:
+            process (subprocess.Popen): Process started in its own session
+        """
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        
+        try:
+            process.wait(timeout=config.YTDLP_KILL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            pass
+        
+        # Helpers may outlive yt-dlp itself or ignore SIGTERM
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        
+        # Reap the process and close its pipes
+        process.communicate()
+    
+    def kill_active_processes(self):
+        """Kill the process groups of every yt-dlp call still running"""
+        with self.process_lock:
+            processes = list(self.active_processes)
+        
+        for process in processes:
+            logger.warning("🔪 Killing leftover yt-dlp process group %s", process.pid)
+            self.kill_process_group(process)
+    
+    @retry(
+        stop=stop_any(stop_after_attempt(config.MAX_RETRIES), deadline_reached),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((subprocess.TimeoutExpired, subprocess.CalledProcessError))
+    )
+    def list_channel_videos(self, channel_url: str, playlist_start: int = 1, playlist_end: Optional[int] = None, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        List video IDs of a channel with a cheap flat extraction
+        
+        Flat entries carry little more than the ID and title, so no date
+        filtering happens here.
+        
+        Args:
+            channel_url (str): YouTube channel URL
+            playlist_start (int): 1-based index of the first video to list
+            playlist_end (int, optional): Index of the last video to list,
+                defaults to the latest MAX_VIDEOS_PER_CHECK videos
+            deadline (float, optional): time.monotonic() by which listing, retries
+                included, must finish
+            
+        Returns:
+            List[Dict]: Video entries (id, title, url), newest first
+        """
+        playlist_end = playlist_end or config.MAX_VIDEOS_PER_CHECK
+        logger.info("🔍 Listing videos %d-%d in channel", playlist_start, playlist_end)
+        
+        output = self.run_ytdlp([
+            '--dump-json',
+            '--flat-playlist',
+            '--no-warnings',
+            '--playlist-start', str(playlist_start),
+            '--playlist-end', str(playlist_end),
+            channel_url
+        ], deadline)
+        
+        return parse_listing(output)
+    
+    @retry(
+        stop=stop_any(stop_after_attempt(config.MAX_RETRIES), deadline_reached),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((subprocess.TimeoutExpired, subprocess.CalledProcessError))
+    )
+    def fetch_video_metadata(self, video_url: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Extract full metadata for a single video
+        
+        Args:
+            video_url (str): YouTube video URL
+            deadline (float, optional): time.monotonic() by which extraction,
+                retries included, must finish
+            
+        Returns:
+            Dict: Video information
+        """
+        if not self.metadata_rate_limiter.acquire(deadline):
+            raise DeadlineExceeded("Time budget used up waiting for the metadata rate limit")
+        
+        output = self.run_ytdlp([
+            '--dump-json',
+            '--no-playlist',
+            '--skip-download',
+            '--no-warnings',
+            video_url
+        ], deadline)
+        
+        return parse_video_metadata(output, video_url)
+    
+    def get_new_channel_videos(self, channel_url: str, from_date: datetime, to_date: datetime, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get videos in a date range that at least one subscriber doesn't have yet
+        
+        Runs in two phases: a flat ID listing filtered in bulk against the
+        videos table, then a parallel, rate-limited full metadata fetch for the
+        remaining IDs only. Upload dates come from the full metadata, so the
+        date window is applied reliably.
+        
+        Args:
+            channel_url (str): YouTube channel URL
+            from_date (datetime): Start date for search
+            to_date (datetime): End date for search
+            deadline (float, optional): time.monotonic() by which enumeration must
+                finish; metadata fetching stops there with the videos found so far
+            
+        Returns:
+            List[Dict]: Videos in the date range not in the library yet, newest first
+        """
+        from_date_str = self.format_date_for_ytdlp(from_date)
+        to_date_str = self.format_date_for_ytdlp(to_date)
+        
+        logger.info("🔍 Searching for videos in channel between %s and %s", from_date_str, to_date_str)
+        
+        # Phase 1: cheap flat listing
+        entries = self.list_channel_videos(channel_url, deadline=deadline)
+        if not entries:
+            logger.info("ℹ️ No videos found in channel")
+            return []
+        
+        # Bulk existence filter. The backend keeps one library record per
+        # youtube_id, saved under the tracker's API user, so a video in the
+        # library is there for every subscriber
+        existing = self.db.get_existing_videos([entry['id'] for entry in entries])
+        new_entries = [entry for entry in entries if entry['id'] not in existing]
+        
+        logger.info("🆕 %d of %d listed videos are new", len(new_entries), len(entries))
+        
+        # Phase 2: full metadata for new IDs, newest first, in parallel batches
+        # sized by the adaptive yt-dlp limit. Stop once a batch reaches videos
+        # older than the date window.
+        videos = []
+        start = 0
+        
+        with ThreadPoolExecutor(max_workers=config.YTDLP_CONCURRENCY_MAX, thread_name_prefix='metadata') as executor:
+            while start < len(new_entries):
+                batch = new_entries[start:start + ytdlp_limiter.current_limit()]
+                start += len(batch)
+                futures = [executor.submit(recorder.bind(self.fetch_video_metadata), entry['url'], deadline=deadline) for entry in batch]
+                reached_older_videos = False
+                
+                for entry, future in zip(batch, futures):
+                    try:
+                        video = future.result()
+                    except DeadlineExceeded:
+                        continue
+                    except Exception as e:
+                        logger.warning("⚠️ Failed to fetch metadata for %s: %s", entry['id'], e)
+                        continue
+                    
+                    upload_date = video.get('upload_date')
+                    
+                    if upload_date and upload_date < from_date_str:
+                        reached_older_videos = True
+                        continue
+                    if upload_date and upload_date > to_date_str:
+                        continue
+                    
+                    videos.append(video)
+                
+                if reached_older_videos:
+                    break
+                
+                # Out of time: newer videos come first, so keep what was found
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning("⏰ Time budget used up after %d of %d metadata fetches", start, len(new_entries))
+                    break
+        
+        logger.info("✅ Found %d new videos in date range", len(videos))
+        return videos
+    
+    @retry(
+        stop=stop_any(stop_after_attempt(config.MAX_RETRIES), deadline_reached),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_not_exception_type(DeadlineExceeded)
+    )
+    def download_video_via_api(self, video_url: str, user_id: str, quality: str = 'best', metadata: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Download a video using the XandTube API
+        
+        Args:
+            video_url (str): YouTube video URL
+            user_id (str): User ID for the download
+            quality (str): Video quality preference
+            metadata (Dict, optional): Already extracted video metadata, so the
+                backend can skip its own extraction
+            deadline (float, optional): time.monotonic() by which the request,
+                retries included, must finish
+            
+        Returns:
+            Dict: Backend response (including downloadId) if the download was
+            initiated successfully, None otherwise
+            
+        Raises:
+            DeadlineExceeded: If the deadline passed before the backend answered
+        """
+        timeout = config.API_TIMEOUT
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("Time budget used up before the download request could be sent")
+            timeout = min(timeout, remaining)
+        
+        try:
+            # Get user token (this would need to be implemented)
+            # For now, we'll use a system token or bypass authentication
+            
+            download_data = {
+                'url': video_url,
+                'quality': quality,
+                'saveToLibrary': True
+            }
+            
+            if metadata:
+                download_data['metadata'] = metadata
+            
+            # Make API request to start download
+            response = call_api(
+                self.session,
+                'post',
+                f"{config.API_BASE_URL}/download/video",
+                json=download_data,
+                headers={
+                    'Content-Type': 'application/json'
+                },
+                timeout=timeout
+            )
+            
+            if response.status_code in [200, 201]:
+                logger.info("✅ Download initiated successfully for video: %s", video_url)
+                try:
+                    return response.json()
+                except ValueError:
+                    return {}
+            else:
+                logger.error("❌ API request failed with status %s: %s", response.status_code, response.text)
+                return None
+                
+        except requests.Timeout as e:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded("Time budget used up waiting for the backend to accept the download") from e
+            logger.error("❌ API request timed out: %s", e)
+            raise
+        except requests.RequestException as e:
+            logger.error("❌ API request failed: %s", e)
+            raise
+        except Exception as e:
+            logger.error("❌ Unexpected error downloading video: %s", e)
+            raise
+    
+    def build_download_metadata(self, video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Convert extracted video information to the backend's metadata format
+        
+        Args:
+            video (Dict): Video information from fetch_video_metadata()
+            
+        Returns:
+            Dict: Backend metadata, or None if the video was not fully extracted
+        """
+        if not video.get('upload_date') and not video.get('duration'):
+            return None
+        
+        return {
+            'youtubeId': video['id'],
+            'title': video['title'],
+            'description': video.get('description', ''),
+            'duration': video.get('duration', 0),
+            'thumbnail': video.get('thumbnail', ''),
+            'originalUrl': video.get('webpage_url') or video['url'],
+            'channelId': video.get('channel_id', ''),
+            'channelName': video.get('uploader', ''),
+            'uploadDate': video.get('upload_date'),
+            'viewCount': video.get('view_count', 0),
+            'tags': video.get('tags', [])
+        }
+    
+    def request_download(self, video: Dict[str, Any], channel_data: Dict[str, Any], quality: str, deadline: Optional[float] = None) -> str:
+        """
+        Request a video download, submitting each video at most once per run
+        
+        The backend keeps a single library record per YouTube video, so when
+        several subscribers need the same video only the first request hits the
+        API and the others are linked to that download. Later runs find the
+        shared record and skip the video for every subscriber. Submissions wait for a
+        free slot in the dispatcher, and download counters are only updated once
+        the backend reports the download as completed.
+        
+        Args:
+            video (Dict): Video information from yt-dlp
+            channel_data (Dict): Channel tracking row requesting the video
+            quality (str): Video quality preference
+            deadline (float, optional): time.monotonic() after which no download is
+                submitted; waits for the user's quota, a dispatcher slot and the
+                backend's answer end there
+            
+        Returns:
+            str: 'submitted', 'linked' or 'failed'
+            
+        Raises:
+            DeadlineExceeded: If the deadline passed before the backend accepted the download
+        """
+        with self.results_lock:
+            shared_download = self.run_downloads.get(video['id'])
+            
+            if shared_download is not None:
+                if shared_download['status'] == 'failed':
+                    return 'failed'
+                
+                shared_download['channel_ids'].append(channel_data['id'])
+                if shared_download['status'] == 'completed':
+                    self.credit_download(channel_data['id'])
+                return 'linked'
+            
+            # Reserve the video before waiting, so other channel workers link to
+            # this submission instead of submitting it a second time
+            shared_download = {
+                'user_id': channel_data['user_id'],
+                'quality': quality,
+                'channel_ids': [channel_data['id']],
+                'status': 'pending'
+            }
+            self.run_downloads[video['id']] = shared_download
+        
+        try:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded("Time budget used up before the download could be submitted")
+            
+            # Only this user's channel worker waits for the user's download quota
+            user_download_limiter = self.get_user_download_limiter(channel_data['user_id'])
+            if user_download_limiter and not user_download_limiter.acquire(deadline):
+                raise DeadlineExceeded("Time budget used up waiting for the user's download quota")
+            
+            # Backpressure: don't queue more than the backend can work through
+            if not self.dispatcher.wait_for_slot(deadline):
+                raise DeadlineExceeded("Time budget used up waiting for a download slot")
+            
+            response = self.download_video_via_api(
+                video['url'], channel_data['user_id'], quality, self.build_download_metadata(video), deadline=deadline
+            )
+            
+        except DeadlineExceeded:
+            # Out of time, not failed: a channel with time left may still submit it
+            with self.results_lock:
+                self.run_downloads.pop(video['id'], None)
+            raise
+        
+        except Exception:
+            with self.results_lock:
+                shared_download['status'] = 'failed'
+            raise
+        
+        if response is None:
+            with self.results_lock:
+                shared_download['status'] = 'failed'
+            return 'failed'
+        
+        def on_complete():
+            with self.results_lock:
+                shared_download['status'] = 'completed'
+                for channel_id in shared_download['channel_ids']:
+                    self.credit_download(channel_id)
+        
+        def on_error(error_message):
+            with self.results_lock:
+                shared_download['status'] = 'failed'
+                self.job_results['total_downloads_failed'] += 1
+        
+        download_id = response.get('downloadId')
+        if download_id:
+            self.dispatcher.track(download_id, video['title'], on_complete, on_error, owner=self)
+        else:
+            # Nothing to poll, so trust the acceptance
+            on_complete()
+        
+        return 'submitted'
+    
+    def credit_download(self, channel_id: Any):
+        """
+        Record a completed download for a channel tracking row
+        
+        Args:
+            channel_id: Channel tracking ID
+        """
+        self.db.record_video_downloaded(channel_id)
+        with self.results_lock:
+            self.job_results['total_videos_downloaded'] += 1
+    
+    def get_user_download_limiter(self, user_id: Any) -> Optional[RateLimiter]:
+        """
+        Get the download quota of a user
+        
+        Args:
+            user_id: Owner of the channel tracking row
+            
+        Returns:
+            RateLimiter: The user's limiter, or None when quotas are disabled
+        """
+        if config.USER_DOWNLOADS_PER_MINUTE <= 0:
+            return None
+        
+        with user_download_limiters_lock:
+            limiter = user_download_limiters.get(str(user_id))
+            if limiter is None:
+                limiter = RateLimiter(config.USER_DOWNLOADS_PER_MINUTE / 60)
+                user_download_limiters[str(user_id)] = limiter
+            return limiter
+    
+    def get_channel_group_key(self, channel_data: Dict[str, Any]) -> str:
+        """
+        Get the normalized identity of a tracked channel
+        
+        Rows that point to the same tab of the same YouTube channel share the
+        same key, so the channel can be enumerated once and the result fanned
+        out to every subscribing user. The channel home, /videos and /featured
+        list the same uploads; other tabs (/shorts, /streams, ...) keep their
+        own key, since the group is listed through its first row's URL.
+        
+        Args:
+            channel_data (Dict): Channel tracking information from database
+            
+        Returns:
+            str: Normalized channel identity, followed by '/<tab>' for other tabs
+        """
+        youtube_channel_id = (channel_data.get('youtube_channel_id') or '').strip()
+        url = (channel_data.get('channel_url') or '').strip()
+        
+        url = re.sub(r'^https?://', '', url)
+        url = re.sub(r'^(www\.|m\.)', '', url)
+        url = url.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+        
+        # The identity is one path segment (/@handle) or two (/channel/ID, /c/name, /user/name)
+        host, _, path = url.partition('/')
+        segments = path.split('/') if path else []
+        identity_length = 1 if segments and segments[0].startswith('@') else 2
+        
+        tab = segments[identity_length].lower() if len(segments) > identity_length else ''
+        tab_suffix = '' if tab in ('', 'videos', 'featured') else '/' + tab
+        
+        # Canonical UC... ID, stored by the backend or part of a /channel/ URL
+        for candidate in (youtube_channel_id, url):
+            match = CHANNEL_ID_PATTERN.search(candidate)
+            if match:
+                return match.group(0) + tab_suffix
+        
+        # Handles are case-insensitive
+        if youtube_channel_id.startswith('@'):
+            return youtube_channel_id.lower() + tab_suffix
+        
+        if identity_length == 1:
+            return segments[0].lower() + tab_suffix
+        
+        return '/'.join([host] + segments[:identity_length]) + tab_suffix
+    
+    def group_channels(self, channels: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Group channel tracking rows by normalized channel identity
+        
+        Args:
+            channels (List[Dict]): Channel tracking records
+            
+        Returns:
+            List[List[Dict]]: Groups of rows, in order of first appearance
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for channel in channels:
+            groups.setdefault(self.get_channel_group_key(channel), []).append(channel)
+        
+        return list(groups.values())
+    
+    def process_channel(self, channel_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a single channel: check for new videos and download them
+        
+        Args:
+            channel_data (Dict): Channel tracking information from database
+            
+        Returns:
+            Dict: Processing results and statistics
+        """
+        return self.process_channel_group([channel_data])[0]
+    
+    def process_channel_group(self, channels: List[Dict[str, Any]], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Enumerate a channel once and process the result for every subscriber
+        
+        Args:
+            channels (List[Dict]): Channel tracking rows sharing the same channel identity
+            deadline (float, optional): time.monotonic() by which enumeration and
+                download submission must finish
+            
+        Returns:
+            List[Dict]: Processing results, one per channel tracking row
+        """
+        channel_name = channels[0]['channel_name']
+        channel_url = channels[0]['channel_url']
+        
+        if len(channels) > 1:
+            logger.info("🎯 Processing channel: %s (%d subscriptions)", channel_name, len(channels))
+        else:
+            logger.info("🎯 Processing channel: %s", channel_name)
+        
+        all_results = [
+            {
+                'channel_id': channel['id'],
+                'channel_name': channel['channel_name'],
+                'success': False,
+                'videos_found': 0,
+                'videos_queued': 0,
+                'videos_skipped': 0,
+                'videos_linked': 0,
+                'error_message': None,
+                'unchecked': False
+            }
+            for channel in channels
+        ]
+        
+        try:
+            # Calculate date range (yesterday)
+            now = datetime.now(config.TIMEZONE)
+            to_date = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+            from_date = to_date - timedelta(days=config.SEARCH_DAYS_BACK)
+            
+            logger.info("📅 Searching for videos from %s to %s", from_date.date(), to_date.date())
+            
+            # Get new videos from channel in date range, once for all subscribers
+            videos = self.get_new_channel_videos(channel_url, from_date, to_date, deadline)
+            
+        except DeadlineExceeded as e:
+            # Out of time, not a broken channel: leave it for a resumed or later run
+            logger.warning("⏰ %s, channel %s left unchecked", e, channel_name)
+            for results in all_results:
+                results['unchecked'] = True
+                results['error_message'] = str(e)
+            return all_results
+            
+        except Exception as e:
+            error_msg = f"Error processing channel {channel_name}: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            for results in all_results:
+                results['error_message'] = error_msg
+            return all_results
+        
+        for channel_data, results in zip(channels, all_results):
+            self.process_channel_videos(channel_data, videos, results, deadline)
+        
+        return all_results
+    
+    def process_channel_videos(self, channel_data: Dict[str, Any], videos: List[Dict[str, Any]], results: Dict[str, Any], deadline: Optional[float] = None):
+        """
+        Check and download enumerated videos for one channel tracking row
+        
+        Args:
+            channel_data (Dict): Channel tracking information from database
+            videos (List[Dict]): Videos found in the channel
+            results (Dict): Processing results to update in place
+            deadline (float, optional): time.monotonic() after which no more
+                downloads are submitted; the next run picks the rest up
+        """
+        channel_id = channel_data['id']
+        channel_name = channel_data['channel_name']
+        quality = channel_data.get('quality', config.DEFAULT_QUALITY)
+        save_to_library = channel_data.get('save_to_library', True)
+        
+        # Per-video messages are sampled per channel (LOG_SAMPLE_*)
+        log_extra = {'channel': channel_name}
+        
+        try:
+            results['videos_found'] = len(videos)
+            
+            if not videos:
+                logger.info("ℹ️ No new videos found for channel: %s", channel_name)
+                results['success'] = True
+                return
+            
+            # Process each video
+            for video in videos:
+                video_title = video['title']
+                
+                logger.info("📹 Processing video: %s", video_title, extra=log_extra)
+                
+                # Download video if save_to_library is enabled
+                if save_to_library:
+                    try:
+                        download_status = self.request_download(video, channel_data, quality, deadline)
+                        
+                        if download_status == 'submitted':
+                            results['videos_queued'] += 1
+                            logger.info("✅ Video download initiated: %s", video_title, extra=log_extra)
+                        elif download_status == 'linked':
+                            results['videos_queued'] += 1
+                            results['videos_linked'] += 1
+                            logger.info("🔗 Video already requested in this run, sharing download: %s", video_title, extra=log_extra)
+                        else:
+                            logger.warning("⚠️ Failed to initiate download for: %s", video_title, extra=log_extra)
+                    except DeadlineExceeded as e:
+                        logger.warning("⏰ %s, leaving the remaining videos for the next run", e, extra=log_extra)
+                        break
+                    except Exception as e:
+                        logger.error("❌ Error downloading video %s: %s", video_title, e, extra=log_extra)
+                        continue
+                else:
+                    logger.info("ℹ️ Save to library disabled, skipping download: %s", video_title, extra=log_extra)
+                    results['videos_skipped'] += 1
+            
+            # Record the videos found
+            latest_video_id = videos[0]['id']  # Assuming first video is latest
+            self.db.record_videos_found(channel_id, len(videos), latest_video_id)
+            
+            results['success'] = True
+            logger.info(
+                "✅ Channel processing completed: %s - Found: %d, Queued: %d, Skipped: %d",
+                channel_name, results['videos_found'], results['videos_queued'], results['videos_skipped']
+            )
+            
+        except Exception as e:
+            error_msg = f"Error processing channel {channel_name}: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            results['error_message'] = error_msg
+            results['success'] = False
+    
+    def record_channel_results(self, channel_data: Dict[str, Any], channel_results: Dict[str, Any], job_results: Dict[str, Any], duration_seconds: Optional[float] = None):
+        """
+        Fold one channel's processing results into the job summary and database
+        
+        Args:
+            channel_data (Dict): Channel tracking information from database
+            channel_results (Dict): Results returned by channel processing
+            job_results (Dict): Job execution summary to update in place
+            duration_seconds (float, optional): Time spent processing the channel
+        """
+        channel_id = channel_data['id']
+        channel_name = channel_data['channel_name']
+        
+        # Cut off by a deadline: no error count and no checkpoint, so a resumed run checks it
+        if channel_results.get('unchecked'):
+            with self.results_lock:
+                job_results['channels_unchecked'] += 1
+                job_results['errors'].append(f"{channel_name}: {channel_results['error_message']}")
+            return
+        
+        # Update job statistics (download callbacks update it from other threads)
+        with self.results_lock:
+            job_results['channels_processed'] += 1
+            
+            if channel_results['success']:
+                job_results['channels_successful'] += 1
+                job_results['total_videos_found'] += channel_results['videos_found']
+                job_results['total_videos_queued'] += channel_results['videos_queued']
+                job_results['total_videos_skipped'] += channel_results['videos_skipped']
+                job_results['total_downloads_shared'] += channel_results.get('videos_linked', 0)
+            
+                # Update channel last check timestamp
+                self.db.update_channel_last_check(channel_id)
+            
+            else:
+                job_results['channels_failed'] += 1
+                error_msg = channel_results.get('error_message') or 'Unknown error'
+                job_results['errors'].append(f"{channel_name}: {error_msg}")
+            
+                # Update channel with error
+                self.db.update_channel_last_check(channel_id, error_msg)
+        
+        # Checkpoint the channel so a restarted run does not process it again
+        if self.run_id is not None:
+            self.db.mark_channel_checkpoint(self.run_id, channel_id, channel_results['success'], duration_seconds)
+    
+    def process_channels(self, channels: List[Dict[str, Any]], job_results: Dict[str, Any]):
+        """
+        Process channel tracking rows, enumerating each channel once
+        
+        Channels are handed to CHANNEL_WORKERS workers by weighted fair queuing
+        on their owners, so a user tracking many channels cannot delay the
+        checks of everyone else. USER_MAX_CONCURRENT_CHECKS caps how many
+        workers a single user occupies. No channel is started once the run
+        deadline has passed, and a channel whose listing runs out of time
+        is not counted as failed; both are left for a resumed or later run.
+        
+        Args:
+            channels (List[Dict]): Channel tracking records
+            job_results (Dict): Job execution summary to update in place
+        """
+        # Enumerate each channel once, no matter how many users track it
+        channel_groups = self.group_channels(channels)
+        logger.info(f"📋 Found {len(channels)} channels to process ({len(channel_groups)} unique)")
+        
+        queue = FairShareQueue(config.get_user_share_weights(), config.USER_MAX_CONCURRENT_CHECKS)
+        for index, group in enumerate(channel_groups):
+            queue.push(index, group, [channel['user_id'] for channel in group])
+        
+        workers = max(1, config.CHANNEL_WORKERS)
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='channel') as executor:
+            running = {}
+            
+            while True:
+                while len(running) < workers and not self.run_deadline_passed():
+                    next_group = queue.pop()
+                    if next_group is None:
+                        break
+                    index, group = next_group
+                    running[executor.submit(self.run_channel_group, group)] = (index, group)
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    index, group = running.pop(future)
+                    group_results, duration_seconds = future.result()
+                    queue.complete(index, duration_seconds)
+                    
+                    for channel, channel_results in zip(group, group_results):
+                        self.record_channel_results(channel, channel_results, job_results, duration_seconds)
+        
+        unchecked = sum(len(group) for group in queue.remaining())
+        if unchecked:
+            error_msg = f"Run deadline reached, {unchecked} channel(s) left unchecked"
+            logger.warning("⏰ %s", error_msg)
+            job_results['channels_unchecked'] += unchecked
+            job_results['errors'].append(error_msg)
+    
+    def run_deadline_passed(self) -> bool:
+        """Whether the current run is past its deadline"""
+        return self.run_deadline is not None and time.monotonic() >= self.run_deadline
+    
+    def run_channel_group(self, group: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Process a channel group, turning failures into per-row results
+        
+        Args:
+            group (List[Dict]): Channel tracking rows of one channel
+            
+        Returns:
+            Tuple[List[Dict], float]: Per-row results and seconds spent
+        """
+        group_start_time = time.monotonic()
+        
+        # One budget for the whole channel, retries included, never past the run deadline
+        deadline = group_start_time + config.CHANNEL_TIME_BUDGET_SECONDS
+        if self.run_deadline is not None:
+            deadline = min(deadline, self.run_deadline)
+        
+        channel_key = self.get_channel_group_key(group[0])
+        
+        try:
+            # Process the channel for all of its subscribers
+            with recorder.channel(channel_key):
+                group_results = self.process_channel_group(group, deadline)
+            
+        except Exception as e:
+            error_msg = f"Failed to process channel {group[0]['channel_name']}: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            group_results = [
+                {'channel_id': channel['id'], 'success': False, 'error_message': error_msg}
+                for channel in group
+            ]
+        
+        duration_seconds = time.monotonic() - group_start_time
+        recorder.record(
+            'channel',
+            key=channel_key,
+            channel_ids=[channel['id'] for channel in group],
+            user_ids=[channel['user_id'] for channel in group],
+            latency=duration_seconds,
+            success=all(results['success'] for results in group_results)
+        )
+        
+        return group_results, duration_seconds
+    
+    def run_tracking_job(self, hour: int, resume: bool = True, run_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Run the main tracking job for all channels scheduled at the specified hour
+        
+        Args:
+            hour (int): Hour of day to process (0-23)
+            resume (bool): Checkpoint the run and skip channels already completed in it
+            run_date (date, optional): Date of the run to resume, defaults to today
+            
+        Returns:
+            Dict: Job execution summary
+        """
+        run_date = run_date or datetime.now(config.TIMEZONE).date()
+        
+        def load_channels():
+            channels = self.db.get_active_channels_for_hour(hour)
+            
+            if resume:
+                channels = self.start_checkpointed_run(hour, run_date, channels)
+            
+            return channels
+        
+        def finish_run():
+            if self.run_id is not None:
+                self.db.finish_tracking_run(self.run_id)
+        
+        return self.run_job(f"hour {hour}", load_channels, finish_run)
+    
+    def start_checkpointed_run(self, hour: int, run_date: date, channels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Start or resume the checkpointed run for an hour and drop completed channels
+        
+        Args:
+            hour (int): Hour of day to process (0-23)
+            run_date (date): Date of the run
+            channels (List[Dict]): Channel tracking records scheduled for the hour
+            
+        Returns:
+            List[Dict]: Channels still to be processed in this run
+        """
+        run = self.db.start_tracking_run(hour, run_date)
+        
+        if not run:
+            logger.warning("⚠️ Could not start checkpointed run, processing all channels")
+            return channels
+        
+        self.run_id = run['id']
+        completed = self.db.get_run_checkpoints(self.run_id)
+        
+        if completed:
+            logger.info(f"♻️ Resuming run {self.run_id} for {run_date}: {len(completed)} channels already completed")
+        
+        return [channel for channel in channels if channel['id'] not in completed]
+    
+    def run_immediate_check(self, channel_ids: List[int]) -> Dict[str, Any]:
+        """
+        Run a tracking job right away for specific channels
+        
+        Used for newly added or reactivated channels so they don't wait for
+        their next scheduled hour.
+        
+        Args:
+            channel_ids (List[int]): Channel tracking IDs to process
+            
+        Returns:
+            Dict: Job execution summary
+        """
+        return self.run_job(
+            f"channels {', '.join(str(channel_id) for channel_id in channel_ids)}",
+            lambda: self.db.get_active_channels_by_ids(channel_ids)
+        )
+    
+    def run_backfill(self, channel_ids: List[int]) -> Dict[str, Any]:
+        """
+        Import the existing catalog of specific channels
+        
+        Args:
+            channel_ids (List[int]): Channel tracking IDs to backfill
+            
+        Returns:
+            Dict: Job execution summary
+        """
+        return self.run_job(
+            f"backfill of channels {', '.join(str(channel_id) for channel_id in channel_ids)}",
+            lambda: self.db.get_active_channels_by_ids(channel_ids),
+            process_channels=self.backfill_channels
+        )
+    
+    def backfill_channels(self, channels: List[Dict[str, Any]], job_results: Dict[str, Any]):
+        """
+        Backfill channel tracking rows one after another
+        
+        Args:
+            channels (List[Dict]): Channel tracking records
+            job_results (Dict): Job execution summary to update in place
+        """
+        for index, channel in enumerate(channels):
+            if self.run_deadline_passed():
+                error_msg = f"Run deadline reached, {len(channels) - index} channel(s) left for the next backfill"
+                logger.warning("⏰ %s", error_msg)
+                job_results['errors'].append(error_msg)
+                break
+            
+            job_results['channels_processed'] += 1
+            
+            try:
+                self.backfill_channel(channel, job_results)
+                job_results['channels_successful'] += 1
+                
+            except Exception as e:
+                error_msg = f"Backfill of {channel['channel_name']} stopped: {str(e)}"
+                logger.error("❌ %s", error_msg)
+                job_results['channels_failed'] += 1
+                job_results['errors'].append(error_msg)
+    
+    def list_backfill_chunk(self, channel_url: str, playlist_start: int) -> List[Dict[str, Any]]:
+        """
+        List one chunk of a channel's catalog within the backfill rate budget
+        
+        Args:
+            channel_url (str): YouTube channel URL
+            playlist_start (int): 1-based index of the first video in the chunk
+            
+        Returns:
+            List[Dict]: Video entries in the chunk
+        """
+        if not self.backfill_rate_limiter.acquire(self.run_deadline):
+            raise DeadlineExceeded("Run deadline reached before the next chunk could be listed")
+        
+        return self.list_channel_videos(
+            channel_url, playlist_start, playlist_start + config.BACKFILL_CHUNK_SIZE - 1, deadline=self.run_deadline
+        )
+    
+    def backfill_channel(self, channel_data: Dict[str, Any], job_results: Dict[str, Any]):
+        """
+        Page through a channel's full listing and queue every missing video
+        
+        Chunks are listed in parallel (BACKFILL_WORKERS ahead of the cursor) but
+        handled in order, and the cursor is persisted after every chunk so an
+        interrupted backfill resumes where it stopped. Download submissions wait
+        for dispatcher slots, which also bounds how far listing runs ahead.
+        
+        Args:
+            channel_data (Dict): Channel tracking information from database
+            job_results (Dict): Job execution summary to update in place
+        """
+        channel_id = channel_data['id']
+        channel_name = channel_data['channel_name']
+        channel_url = channel_data['channel_url']
+        quality = channel_data.get('quality', config.DEFAULT_QUALITY)
+        chunk_size = config.BACKFILL_CHUNK_SIZE
+        
+        state = self.db.get_backfill_state(channel_id)
+        if state is None:
+            raise Exception("Could not load backfill state")
+        
+        if state['completed']:
+            logger.info("✅ Backfill already completed for channel: %s", channel_name)
+            return
+        
+        if not channel_data.get('save_to_library', True):
+            logger.info("ℹ️ Save to library disabled, skipping backfill: %s", channel_name)
+            return
+        
+        next_index = state['next_index']
+        logger.info("📚 Backfilling channel %s from video %d", channel_name, next_index)
+        
+        with ThreadPoolExecutor(max_workers=config.BACKFILL_WORKERS, thread_name_prefix='backfill') as executor:
+            pending = {}
+            scheduled_until = next_index
+            
+            try:
+                while True:
+                    # Keep BACKFILL_WORKERS chunk listings running ahead of the cursor
+                    while len(pending) < config.BACKFILL_WORKERS:
+                        pending[scheduled_until] = executor.submit(self.list_backfill_chunk, channel_url, scheduled_until)
+                        scheduled_until += chunk_size
+                    
+                    entries = pending.pop(next_index).result()
+                    
+                    existing = self.db.get_existing_videos([entry['id'] for entry in entries])
+                    queued = 0
+                    saved = 0
+                    
+                    for position, entry in enumerate(entries):
+                        if entry['id'] in existing:
+                            job_results['total_videos_skipped'] += 1
+                            continue
+                        
+                        if self.request_download(entry, channel_data, quality, self.run_deadline) != 'failed':
+                            queued += 1
+                            job_results['total_videos_queued'] += 1
+                            
+                            # Move the cursor past each submitted video: a chunk cut off by the
+                            # deadline resumes after it instead of submitting it a second time
+                            self.db.save_backfill_state(channel_id, next_index + position + 1, position + 1 - saved, 1, False)
+                            saved = position + 1
+                    
+                    if queued:
+                        self.db.record_videos_found(channel_id, queued)
+                    
+                    job_results['total_videos_found'] += len(entries)
+                    
+                    completed = len(entries) < chunk_size
+                    next_index += chunk_size
+                    self.db.save_backfill_state(channel_id, next_index, len(entries) - saved, 0, completed)
+                    
+                    logger.info("📚 %s: videos up to %d listed, %d queued from this chunk", channel_name, next_index - 1, queued)
+                    
+                    if completed:
+                        logger.info("✅ Backfill completed for channel: %s", channel_name)
+                        return
+            
+            finally:
+                for future in pending.values():
+                    future.cancel()
+    
+    def run_job(self, label: str, load_channels: Callable[[], List[Dict[str, Any]]], on_complete: Optional[Callable[[], None]] = None, process_channels: Optional[Callable[[List[Dict[str, Any]], Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Run a tracking job over the channels returned by a loader
+        
+        Args:
+            label (str): Description of the job for logging
+            load_channels (Callable): Returns the channel tracking records to process
+            on_complete (Callable, optional): Called after all channels were processed,
+                not when the run deadline left channels unchecked
+            process_channels (Callable, optional): Processes the loaded channels,
+                defaults to the regular tracking check
+            
+        Returns:
+            Dict: Job execution summary
+        """
+        job_start_time = datetime.now(config.TIMEZONE)
+        logger.info(f"🚀 Starting channel tracking job for {label} at {job_start_time}")
+        
+        job_results = {
+            'start_time': job_start_time,
+            'end_time': None,
+            'duration_seconds': 0,
+            'channels_processed': 0,
+            'channels_successful': 0,
+            'channels_failed': 0,
+            'channels_unchecked': 0,
+            'total_videos_found': 0,
+            'total_videos_queued': 0,
+            'total_videos_downloaded': 0,
+            'total_videos_skipped': 0,
+            'total_downloads_shared': 0,
+            'total_downloads_failed': 0,
+            'total_downloads_pending': 0,
+            'errors': []
+        }
+        
+        # Coalesce downloads by YouTube video ID for the duration of this run
+        self.run_downloads = {}
+        self.job_results = job_results
+        self.run_deadline = time.monotonic() + config.RUN_DEADLINE_SECONDS
+        recorder.record(
+            'run',
+            label=label,
+            phase='start',
+            channel_workers=config.CHANNEL_WORKERS,
+            ytdlp_concurrency=ytdlp_limiter.current_limit(),
+            download_queue_depth=config.DOWNLOAD_QUEUE_DEPTH
+        )
+        
+        try:
+            # Connect to database
+            if not self.db.connect():
+                raise Exception("Failed to connect to database")
+            
+            channels = load_channels()
+            
+            if channels:
+                (process_channels or self.process_channels)(channels, job_results)
+                
+                # Counters are updated as the backend completes downloads
+                drain_timeout = min(config.DOWNLOAD_DRAIN_TIMEOUT, max(0, self.run_deadline - time.monotonic()))
+                job_results['total_downloads_pending'] = self.dispatcher.drain(drain_timeout, owner=self)
+            else:
+                logger.info(f"ℹ️ No active channels found for {label}")
+            
+            if on_complete and not job_results['channels_unchecked']:
+                on_complete()
+            
+        except Exception as e:
+            error_msg = f"Job execution failed: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            job_results['errors'].append(error_msg)
+            
+        finally:
+            # Clean up database connection and anything still running
+            self.kill_active_processes()
+            self.dispatcher.abandon(owner=self)
+            self.db.disconnect()
+            self.run_id = None
+            self.run_deadline = None
+            
+            # Calculate job duration
+            job_results['end_time'] = datetime.now(config.TIMEZONE)
+            job_results['duration_seconds'] = (job_results['end_time'] - job_results['start_time']).total_seconds()
+            recorder.record('run', label=label, phase='end', latency=job_results['duration_seconds'])
+            
+            # Log job summary
+            logger.info(f"🏁 Job completed in {job_results['duration_seconds']:.2f} seconds")
+            logger.info(f"📊 Channels: {job_results['channels_processed']} processed, {job_results['channels_successful']} successful, {job_results['channels_failed']} failed")
+            logger.info(f"📹 Videos: {job_results['total_videos_found']} found, {job_results['total_videos_queued']} queued, {job_results['total_videos_downloaded']} downloaded, {job_results['total_videos_skipped']} skipped, {job_results['total_downloads_shared']} shared")
+            
+            if job_results['total_downloads_failed'] or job_results['total_downloads_pending']:
+                logger.warning(f"⚠️ Downloads: {job_results['total_downloads_failed']} failed, {job_results['total_downloads_pending']} still pending on the backend")
+            
+            if job_results['errors']:
+                logger.warning(f"⚠️ Errors occurred: {len(job_results['errors'])}")
+                for error in job_results['errors']:
+                    logger.warning(f"   - {error}")
+        
+        return job_results
+
+# Global tracker instance
+tracker = ChannelTracker()
+
+def main():
+    """Main entry point for manual execution"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='XandTube Channel Tracking Job')
+    parser.add_argument('--hour', type=int, help='Hour to process (0-23)', default=datetime.now().hour)
+    parser.add_argument('--test', action='store_true', help='Test mode - process all active channels regardless of hour')
+    parser.add_argument('--resume', action='store_true', help='Checkpoint the run and skip channels already completed today')
+    parser.add_argument('--backfill', type=int, nargs='+', metavar='CHANNEL_ID',
+                        help='Import the existing catalog of these channel tracking IDs (resumable)')
+    
+    args = parser.parse_args()
+    
+    if args.backfill:
+        logger.info(f"📚 Running backfill for {len(args.backfill)} channel(s)")
+        results = tracker.run_backfill(args.backfill)
+    elif args.test:
+        logger.info("🧪 Running in test mode - processing all active channels")
+        # In test mode, we could process all channels or use current hour
+        results = tracker.run_tracking_job(datetime.now().hour, resume=False)
+    else:
+        results = tracker.run_tracking_job(args.hour, resume=args.resume)
+    
+    # Print results
+    print(f"\n📋 Job Summary:")
+    print(f"   Duration: {results['duration_seconds']:.2f} seconds")
+    print(f"   Channels processed: {results['channels_processed']}")
+    print(f"   Videos found: {results['total_videos_found']}")
+    print(f"   Videos downloaded: {results['total_videos_downloaded']}")
+    
+    if results['errors']:
+        print(f"   Errors: {len(results['errors'])}")
+
+if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,80 +1,166 @@
-"""
-Configuration module for XandTube Channel Tracking Jobs
-Handles environment variables and default settings
-"""
-
-import os
-import pytz
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-class Config:
-    """Configuration class for channel tracking jobs"""
-    
-    # Database Configuration
-    DB_HOST = os.getenv('DB_HOST', 'localhost')
-    DB_PORT = os.getenv('DB_PORT', '5432')
-    DB_NAME = os.getenv('DB_NAME', 'xandtube')
-    DB_USER = os.getenv('DB_USER', 'postgres')
-    DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
-    
-    # Job Scheduling Configuration
-    TIMEZONE = pytz.timezone('America/Sao_Paulo')  # BRT timezone
-    DEFAULT_CHECK_HOUR = 2  # 2:00 AM BRT
-    JOB_MAX_WORKERS = 3  # Maximum concurrent job workers
-    
-    # YT-DLP Configuration
-    YTDLP_COMMAND = 'yt-dlp'
-    YTDLP_TIMEOUT = 300  # 5 minutes timeout for yt-dlp commands
-    MAX_RETRIES = 3
-    RETRY_DELAY = 60  # 1 minute delay between retries
-    
-    # Video Quality Settings
-    DEFAULT_QUALITY = 'best'
-    QUALITY_OPTIONS = ['best', 'worst', '720p', '480p', '360p', '1080p']
-    
-    # Logging Configuration
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    LOG_FILE = 'logs/channel_tracking.log'
-    
-    # File Paths
-    DOWNLOADS_PATH = os.getenv('DOWNLOADS_PATH', '../videos/downloads')
-    METADATA_PATH = os.getenv('METADATA_PATH', '../videos/metadata')
-    
-    # API Configuration
-    API_BASE_URL = os.getenv('API_BASE_URL', 'http://192.168.3.46:3001/api')
-    API_TIMEOUT = 30  # seconds
-    
-    # Error Handling
-    MAX_CONSECUTIVE_ERRORS = 5  # Auto-disable channel after this many errors
-    ERROR_COOLDOWN_HOURS = 24  # Hours to wait before retrying failed channels
-    
-    # Date Range Configuration
-    SEARCH_DAYS_BACK = 1  # How many days back to search for new videos
-    MAX_VIDEOS_PER_CHECK = 50  # Maximum videos to process per channel check
-    
-    @classmethod
-    def get_db_url(cls):
-        """Get database connection URL"""
-        return f"postgresql://{cls.DB_USER}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
-    
-    @classmethod
-    def validate_config(cls):
-        """Validate essential configuration parameters"""
-        required_vars = ['DB_HOST', 'DB_NAME', 'DB_USER', 'DB_PASSWORD']
-        missing_vars = []
-        
-        for var in required_vars:
-            if not getattr(cls, var):
-                missing_vars.append(var)
-        
-        if missing_vars:
-            raise ValueError(f"Missing required configuration variables: {', '.join(missing_vars)}")
-        
-        return True
-
-# Create a default config instance
+"""
+Configuration module for XandTube Channel Tracking Jobs
+Handles environment variables and default settings
+"""
+
+import os
+import pytz
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+class Config:
+    """Configuration class for channel tracking jobs"""
+    
+    # Database Configuration
+    DB_HOST = os.getenv('DB_HOST', 'localhost')
+    DB_PORT = os.getenv('DB_PORT', '5432')
+    DB_NAME = os.getenv('DB_NAME', 'xandtube')
+    DB_USER = os.getenv('DB_USER', 'postgres')
+    DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
+    
+    # Job Scheduling Configuration
+    TIMEZONE = pytz.timezone('America/Sao_Paulo')  # BRT timezone
+    DEFAULT_CHECK_HOUR = 2  # 2:00 AM BRT
+    ADDITIONAL_CHECK_HOURS = [6, 12, 18]  # 6 AM, 12 PM, 6 PM
+    JOB_MAX_WORKERS = 3  # Maximum concurrent job workers
+    RUN_RESUME_WINDOW_HOURS = 12  # Resume interrupted runs started within this window
+    
+    # Fair-Share Configuration (per-user scheduling within a run)
+    CHANNEL_WORKERS = int(os.getenv('CHANNEL_WORKERS', '1'))  # Channels checked in parallel
+    USER_SHARE_WEIGHTS = os.getenv('USER_SHARE_WEIGHTS', '')  # e.g. "12:2,34:0.5" (user_id:weight)
+    USER_MAX_CONCURRENT_CHECKS = int(os.getenv('USER_MAX_CONCURRENT_CHECKS', '0'))  # 0 = no limit
+    USER_DOWNLOADS_PER_MINUTE = float(os.getenv('USER_DOWNLOADS_PER_MINUTE', '0'))  # 0 = no limit
+    
+    # Schedule Rebalancing Configuration
+    REBALANCE_HISTORY_DAYS = 14  # Days of run checkpoints used to estimate channel cost
+    REBALANCE_DEFAULT_COST_SECONDS = 30  # Assumed cost of channels without history
+    
+    # Event-Driven Tracking Configuration (Postgres LISTEN/NOTIFY)
+    EVENT_TRACKING_ENABLED = os.getenv('EVENT_TRACKING_ENABLED', 'true').lower() == 'true'
+    EVENT_NOTIFY_CHANNEL = 'channel_tracking_changed'  # Must match migrations/002
+    EVENT_DEBOUNCE_SECONDS = 10  # Quiet period before processing a burst of notifications
+    EVENT_DEBOUNCE_MAX_WAIT_SECONDS = 60  # Dispatch a batch this long after its first notification regardless
+    EVENT_MAX_CONCURRENT = 2  # Maximum immediate checks running at once
+    
+    # YT-DLP Configuration
+    YTDLP_COMMAND = 'yt-dlp'
+    YTDLP_TIMEOUT = 300  # 5 minutes timeout for yt-dlp commands
+    YTDLP_KILL_GRACE_SECONDS = 5  # Wait after SIGTERM before killing the yt-dlp process group
+    CHANNEL_TIME_BUDGET_SECONDS = int(os.getenv('CHANNEL_TIME_BUDGET_SECONDS', '600'))  # Per channel, retries included
+    RUN_DEADLINE_SECONDS = int(os.getenv('RUN_DEADLINE_SECONDS', '12600'))  # 3.5h, below the gap between scheduled runs
+    MAX_RETRIES = 3
+    RETRY_DELAY = 60  # 1 minute delay between retries
+    METADATA_FETCH_WORKERS = 4  # Parallel full-metadata extractions per channel
+    METADATA_FETCH_RATE = 2.0  # Full-metadata extractions started per second (all channels)
+    PARSE_PROCESS_POOL_ENABLED = os.getenv('PARSE_PROCESS_POOL_ENABLED', 'false').lower() == 'true'  # Decode yt-dlp output in worker processes
+    PARSE_POOL_WORKERS = 2  # Parsing processes
+    PARSE_POOL_MIN_LINES = 100  # Listings shorter than this are parsed in-thread
+    PARSE_POOL_CHUNK_LINES = 500  # Listing lines sent to a parsing process at once
+    
+    # Adaptive Concurrency Configuration (AIMD controllers in adaptive_limiter.py)
+    ADAPTIVE_CONCURRENCY_ENABLED = os.getenv('ADAPTIVE_CONCURRENCY_ENABLED', 'true').lower() == 'true'
+    ADAPTIVE_WINDOW_SIZE = 10  # Calls observed between two decisions
+    ADAPTIVE_ERROR_RATE_THRESHOLD = 0.2  # Error share that triggers a decrease
+    ADAPTIVE_DECREASE_FACTOR = 0.5  # Multiplicative decrease on errors or high latency
+    YTDLP_CONCURRENCY_MIN = 1
+    YTDLP_CONCURRENCY_MAX = int(os.getenv('YTDLP_CONCURRENCY_MAX', '8'))  # Starts at METADATA_FETCH_WORKERS
+    YTDLP_TARGET_LATENCY_SECONDS = 60
+    API_CONCURRENCY_MIN = 1
+    API_CONCURRENCY_INITIAL = 4
+    API_CONCURRENCY_MAX = int(os.getenv('API_CONCURRENCY_MAX', '16'))
+    API_TARGET_LATENCY_SECONDS = 5
+    
+    # Video Quality Settings
+    DEFAULT_QUALITY = 'best'
+    QUALITY_OPTIONS = ['best', 'worst', '720p', '480p', '360p', '1080p']
+    
+    # Logging Configuration
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    LOG_FILE = 'logs/channel_tracking.log'
+    LOG_JSON = os.getenv('LOG_JSON', 'false').lower() == 'true'  # One JSON object per line
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate the log file at 10 MB
+    LOG_BACKUP_COUNT = 5  # Rotated log files kept
+    LOG_QUEUE_SIZE = 10000  # Records buffered for the background writer before INFO and below are dropped
+    LOG_SAMPLE_FIRST = 20  # Verbose per-video records kept per channel and window
+    LOG_SAMPLE_EVERY = 10  # Then keep one in this many (0 = drop the rest)
+    LOG_SAMPLE_WINDOW_SECONDS = 3600
+    
+    # File Paths
+    DOWNLOADS_PATH = os.getenv('DOWNLOADS_PATH', '../videos/downloads')
+    METADATA_PATH = os.getenv('METADATA_PATH', '../videos/metadata')
+    MIGRATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+    
+    # API Configuration
+    API_BASE_URL = os.getenv('API_BASE_URL', 'http://192.168.3.46:3001/api')
+    API_TIMEOUT = 30  # seconds
+    API_TOKEN = os.getenv('API_TOKEN', '')  # Bearer token for the tracker's API user
+    
+    # Download Dispatch Configuration
+    DOWNLOAD_QUEUE_DEPTH = int(os.getenv('DOWNLOAD_QUEUE_DEPTH', '4'))  # Max downloads in flight on the backend
+    DOWNLOAD_POLL_INTERVAL = 5  # Seconds between backend progress polls
+    DOWNLOAD_MAX_WAIT_SECONDS = 3600  # Give up on a download after this long
+    DOWNLOAD_DRAIN_TIMEOUT = 1800  # Max seconds a run waits for its downloads to finish
+    
+    # Trace Recording Configuration (replayed by simulator.py)
+    TRACE_RECORD_PATH = os.getenv('TRACE_RECORD_PATH', '')  # e.g. logs/trace.jsonl, empty = off
+    
+    # Health Endpoint Configuration
+    HEALTH_SERVER_ENABLED = os.getenv('HEALTH_SERVER_ENABLED', 'true').lower() == 'true'
+    HEALTH_SERVER_HOST = os.getenv('HEALTH_SERVER_HOST', '127.0.0.1')
+    HEALTH_SERVER_PORT = int(os.getenv('HEALTH_SERVER_PORT', '8089'))
+    
+    # Error Handling
+    MAX_CONSECUTIVE_ERRORS = 5  # Auto-disable channel after this many errors
+    ERROR_COOLDOWN_HOURS = 24  # Hours to wait before retrying failed channels
+    
+    # Date Range Configuration
+    SEARCH_DAYS_BACK = 1  # How many days back to search for new videos
+    MAX_VIDEOS_PER_CHECK = 50  # Maximum videos to process per channel check
+    
+    # Backfill Configuration (channel_tracker.py --backfill)
+    BACKFILL_CHUNK_SIZE = 200  # Videos listed per yt-dlp call
+    BACKFILL_WORKERS = 3  # Chunk listings running ahead of the cursor
+    BACKFILL_LISTING_RATE = 0.5  # Chunk listings started per second
+    
+    @classmethod
+    def get_db_url(cls):
+        """Get database connection URL"""
+        return f"postgresql://{cls.DB_USER}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
+    
+    @classmethod
+    def get_check_hours(cls):
+        """Get all hours that have a scheduled tracking run"""
+        return sorted({cls.DEFAULT_CHECK_HOUR, *cls.ADDITIONAL_CHECK_HOURS})
+    
+    @classmethod
+    def get_user_share_weights(cls):
+        """Parse USER_SHARE_WEIGHTS into a user ID -> weight mapping"""
+        weights = {}
+        for pair in cls.USER_SHARE_WEIGHTS.split(','):
+            if ':' not in pair:
+                continue
+            user_id, weight = pair.rsplit(':', 1)
+            if float(weight) > 0:
+                weights[user_id.strip()] = float(weight)
+        return weights
+    
+    @classmethod
+    def validate_config(cls):
+        """Validate essential configuration parameters"""
+        required_vars = ['DB_HOST', 'DB_NAME', 'DB_USER', 'DB_PASSWORD']
+        missing_vars = []
+        
+        for var in required_vars:
+            if not getattr(cls, var):
+                missing_vars.append(var)
+        
+        if missing_vars:
+            raise ValueError(f"Missing required configuration variables: {', '.join(missing_vars)}")
+        
+        return True
+
+# Create a default config instance
 config = Config()
\ No newline at end of file
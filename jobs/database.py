@@ -1,295 +1,724 @@
-"""
-Database connection and operations module for XandTube Channel Tracking Jobs
-Handles PostgreSQL connections and channel tracking operations
-"""
-
-import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
-import json
-
-from config import config
-
-# Set up logging
-logger = logging.getLogger(__name__)
-
-class DatabaseManager:
-    """Manages database connections and operations for channel tracking"""
-    
-    def __init__(self):
-        self.connection = None
-        self.cursor = None
-    
-    def connect(self) -> bool:
-        """
-        Establish database connection
-        
-        Returns:
-            bool: True if connection successful, False otherwise
-        """
-        try:
-            self.connection = psycopg2.connect(
-                host=config.DB_HOST,
-                port=config.DB_PORT,
-                database=config.DB_NAME,
-                user=config.DB_USER,
-                password=config.DB_PASSWORD,
-                cursor_factory=RealDictCursor
-            )
-            self.cursor = self.connection.cursor()
-            logger.info("✅ Database connection established successfully")
-            return True
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Database connection failed: {e}")
-            return False
-    
-    def disconnect(self):
-        """Close database connection"""
-        try:
-            if self.cursor:
-                self.cursor.close()
-            if self.connection:
-                self.connection.close()
-            logger.info("🔌 Database connection closed")
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error closing database connection: {e}")
-    
-    def __enter__(self):
-        """Context manager entry"""
-        self.connect()
-        return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        self.disconnect()
-    
-    def get_active_channels_for_hour(self, hour: int) -> List[Dict[str, Any]]:
-        """
-        Get all active channels scheduled for the specified hour
-        
-        Args:
-            hour (int): Hour of day (0-23)
-            
-        Returns:
-            List[Dict]: List of channel tracking records
-        """
-        try:
-            query = """
-                SELECT ct.*, u.username, u.email
-                FROM channel_tracking ct
-                LEFT JOIN users u ON ct.user_id = u.id
-                WHERE ct.is_active = true 
-                AND ct.scheduled_hour = %s
-                AND (ct.error_count < %s OR ct.last_check < %s)
-                ORDER BY ct.last_check ASC NULLS FIRST
-            """
-            
-            # Don't check channels that have failed recently
-            error_cooldown = datetime.now() - timedelta(hours=config.ERROR_COOLDOWN_HOURS)
-            
-            self.cursor.execute(query, (hour, config.MAX_CONSECUTIVE_ERRORS, error_cooldown))
-            channels = self.cursor.fetchall()
-            
-            logger.info(f"📋 Found {len(channels)} active channels for hour {hour}")
-            return [dict(channel) for channel in channels]
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error fetching active channels: {e}")
-            return []
-    
-    def update_channel_last_check(self, channel_id: str, error_message: Optional[str] = None) -> bool:
-        """
-        Update the last check timestamp for a channel
-        
-        Args:
-            channel_id (str): Channel tracking ID
-            error_message (str, optional): Error message if check failed
-            
-        Returns:
-            bool: True if update successful
-        """
-        try:
-            if error_message:
-                # Increment error count and record error
-                query = """
-                    UPDATE channel_tracking 
-                    SET last_check = %s, 
-                        error_count = error_count + 1,
-                        last_error = %s,
-                        is_active = CASE 
-                            WHEN error_count + 1 >= %s THEN false 
-                            ELSE is_active 
-                        END
-                    WHERE id = %s
-                """
-                self.cursor.execute(query, (
-                    datetime.now(), 
-                    error_message, 
-                    config.MAX_CONSECUTIVE_ERRORS,
-                    channel_id
-                ))
-            else:
-                # Reset error count on successful check
-                query = """
-                    UPDATE channel_tracking 
-                    SET last_check = %s, 
-                        error_count = 0,
-                        last_error = NULL
-                    WHERE id = %s
-                """
-                self.cursor.execute(query, (datetime.now(), channel_id))
-            
-            self.connection.commit()
-            return True
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error updating channel last check: {e}")
-            self.connection.rollback()
-            return False
-    
-    def record_videos_found(self, channel_id: str, video_count: int, last_video_id: Optional[str] = None) -> bool:
-        """
-        Record the number of videos found during a check
-        
-        Args:
-            channel_id (str): Channel tracking ID
-            video_count (int): Number of videos found
-            last_video_id (str, optional): ID of the latest video found
-            
-        Returns:
-            bool: True if update successful
-        """
-        try:
-            query = """
-                UPDATE channel_tracking 
-                SET total_videos_found = total_videos_found + %s,
-                    last_video_id = COALESCE(%s, last_video_id)
-                WHERE id = %s
-            """
-            self.cursor.execute(query, (video_count, last_video_id, channel_id))
-            self.connection.commit()
-            return True
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error recording videos found: {e}")
-            self.connection.rollback()
-            return False
-    
-    def record_video_downloaded(self, channel_id: str) -> bool:
-        """
-        Increment the downloaded video count for a channel
-        
-        Args:
-            channel_id (str): Channel tracking ID
-            
-        Returns:
-            bool: True if update successful
-        """
-        try:
-            query = """
-                UPDATE channel_tracking 
-                SET total_videos_downloaded = total_videos_downloaded + 1
-                WHERE id = %s
-            """
-            self.cursor.execute(query, (channel_id,))
-            self.connection.commit()
-            return True
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error recording video download: {e}")
-            self.connection.rollback()
-            return False
-    
-    def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """
-        Get user information by ID
-        
-        Args:
-            user_id (str): User ID
-            
-        Returns:
-            Dict: User information or None if not found
-        """
-        try:
-            query = "SELECT * FROM users WHERE id = %s"
-            self.cursor.execute(query, (user_id,))
-            user = self.cursor.fetchone()
-            
-            return dict(user) if user else None
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error fetching user: {e}")
-            return None
-    
-    def check_video_exists(self, youtube_id: str, user_id: str) -> bool:
-        """
-        Check if a video already exists for a user
-        
-        Args:
-            youtube_id (str): YouTube video ID
-            user_id (str): User ID
-            
-        Returns:
-            bool: True if video exists
-        """
-        try:
-            query = """
-                SELECT 1 FROM videos 
-                WHERE youtube_id = %s AND user_id = %s
-                LIMIT 1
-            """
-            self.cursor.execute(query, (youtube_id, user_id))
-            result = self.cursor.fetchone()
-            
-            return result is not None
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error checking video existence: {e}")
-            return False
-    
-    def get_channel_stats(self) -> Dict[str, Any]:
-        """
-        Get overall channel tracking statistics
-        
-        Returns:
-            Dict: Statistics summary
-        """
-        try:
-            query = """
-                SELECT 
-                    COUNT(*) as total_channels,
-                    COUNT(*) FILTER (WHERE is_active = true) as active_channels,
-                    COUNT(*) FILTER (WHERE error_count > 0) as channels_with_errors,
-                    SUM(total_videos_found) as total_videos_found,
-                    SUM(total_videos_downloaded) as total_videos_downloaded,
-                    AVG(total_videos_downloaded::float / NULLIF(total_videos_found, 0)) as avg_success_rate
-                FROM channel_tracking
-            """
-            self.cursor.execute(query)
-            stats = self.cursor.fetchone()
-            
-            return dict(stats) if stats else {}
-            
-        except psycopg2.Error as e:
-            logger.error(f"❌ Error fetching channel stats: {e}")
-            return {}
-    
-    def cleanup_old_logs(self, days_to_keep: int = 30) -> int:
-        """
-        Clean up old tracking logs (if implemented)
-        
-        Args:
-            days_to_keep (int): Number of days of logs to keep
-            
-        Returns:
-            int: Number of records cleaned up
-        """
-        # This would be implemented if we had a separate logs table
-        # For now, just return 0
-        return 0
-
-# Global database manager instance
+"""
+Database connection and operations module for XandTube Channel Tracking Jobs
+Handles PostgreSQL connections and channel tracking operations
+"""
+
+import os
+import logging
+import threading
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from typing import List, Dict, Optional, Any
+from datetime import date, datetime, timedelta
+import json
+
+from config import config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class DatabaseManager:
+    """Manages database connections and operations for channel tracking"""
+    
+    def __init__(self):
+        self.connection = None
+        self.cursor = None
+    
+    def connect(self) -> bool:
+        """
+        Establish database connection
+        
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        try:
+            self.connection = psycopg2.connect(
+                host=config.DB_HOST,
+                port=config.DB_PORT,
+                database=config.DB_NAME,
+                user=config.DB_USER,
+                password=config.DB_PASSWORD,
+                cursor_factory=RealDictCursor
+            )
+            self.cursor = self.connection.cursor()
+            logger.info("✅ Database connection established successfully")
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Database connection failed: {e}")
+            return False
+    
+    def disconnect(self):
+        """Close database connection"""
+        try:
+            if self.cursor:
+                self.cursor.close()
+            if self.connection:
+                self.connection.close()
+            logger.info("🔌 Database connection closed")
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error closing database connection: {e}")
+    
+    def __enter__(self):
+        """Context manager entry"""
+        self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.disconnect()
+    
+    def get_active_channels_for_hour(self, hour: int) -> List[Dict[str, Any]]:
+        """
+        Get all active channels scheduled for the specified hour
+        
+        Args:
+            hour (int): Hour of day (0-23)
+            
+        Returns:
+            List[Dict]: List of channel tracking records
+        """
+        try:
+            query = """
+                SELECT ct.*, u.username, u.email
+                FROM channel_tracking ct
+                LEFT JOIN users u ON ct.user_id = u.id
+                WHERE ct.is_active = true 
+                AND ct.scheduled_hour = %s
+                AND (ct.error_count < %s OR ct.last_check < %s)
+                ORDER BY ct.last_check ASC NULLS FIRST
+            """
+            
+            # Don't check channels that have failed recently
+            error_cooldown = datetime.now() - timedelta(hours=config.ERROR_COOLDOWN_HOURS)
+            
+            self.cursor.execute(query, (hour, config.MAX_CONSECUTIVE_ERRORS, error_cooldown))
+            channels = self.cursor.fetchall()
+            
+            logger.info(f"📋 Found {len(channels)} active channels for hour {hour}")
+            return [dict(channel) for channel in channels]
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching active channels: {e}")
+            return []
+    
+    def get_active_channels_by_ids(self, channel_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get active channels by their channel tracking IDs
+        
+        Args:
+            channel_ids (List[int]): Channel tracking IDs
+            
+        Returns:
+            List[Dict]: List of channel tracking records
+        """
+        try:
+            query = """
+                SELECT ct.*, u.username, u.email
+                FROM channel_tracking ct
+                LEFT JOIN users u ON ct.user_id = u.id
+                WHERE ct.is_active = true 
+                AND ct.id = ANY(%s)
+                ORDER BY ct.last_check ASC NULLS FIRST
+            """
+            
+            self.cursor.execute(query, (list(channel_ids),))
+            channels = self.cursor.fetchall()
+            
+            logger.info(f"📋 Found {len(channels)} active channels out of {len(channel_ids)} requested")
+            return [dict(channel) for channel in channels]
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching channels by ID: {e}")
+            self.connection.rollback()
+            return []
+    
+    def update_channel_last_check(self, channel_id: str, error_message: Optional[str] = None) -> bool:
+        """
+        Update the last check timestamp for a channel
+        
+        Args:
+            channel_id (str): Channel tracking ID
+            error_message (str, optional): Error message if check failed
+            
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            if error_message:
+                # Increment error count and record error
+                query = """
+                    UPDATE channel_tracking 
+                    SET last_check = %s, 
+                        error_count = error_count + 1,
+                        last_error = %s,
+                        is_active = CASE 
+                            WHEN error_count + 1 >= %s THEN false 
+                            ELSE is_active 
+                        END
+                    WHERE id = %s
+                """
+                self.cursor.execute(query, (
+                    datetime.now(), 
+                    error_message, 
+                    config.MAX_CONSECUTIVE_ERRORS,
+                    channel_id
+                ))
+            else:
+                # Reset error count on successful check
+                query = """
+                    UPDATE channel_tracking 
+                    SET last_check = %s, 
+                        error_count = 0,
+                        last_error = NULL
+                    WHERE id = %s
+                """
+                self.cursor.execute(query, (datetime.now(), channel_id))
+            
+            self.connection.commit()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error updating channel last check: {e}")
+            self.connection.rollback()
+            return False
+    
+    def record_videos_found(self, channel_id: str, video_count: int, last_video_id: Optional[str] = None) -> bool:
+        """
+        Record the number of videos found during a check
+        
+        Args:
+            channel_id (str): Channel tracking ID
+            video_count (int): Number of videos found
+            last_video_id (str, optional): ID of the latest video found
+            
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            query = """
+                UPDATE channel_tracking 
+                SET total_videos_found = total_videos_found + %s,
+                    last_video_id = COALESCE(%s, last_video_id)
+                WHERE id = %s
+            """
+            self.cursor.execute(query, (video_count, last_video_id, channel_id))
+            self.connection.commit()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error recording videos found: {e}")
+            self.connection.rollback()
+            return False
+    
+    def record_video_downloaded(self, channel_id: str) -> bool:
+        """
+        Increment the downloaded video count for a channel
+        
+        Args:
+            channel_id (str): Channel tracking ID
+            
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            query = """
+                UPDATE channel_tracking 
+                SET total_videos_downloaded = total_videos_downloaded + 1
+                WHERE id = %s
+            """
+            self.cursor.execute(query, (channel_id,))
+            self.connection.commit()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error recording video download: {e}")
+            self.connection.rollback()
+            return False
+    
+    def start_tracking_run(self, hour: int, run_date: date) -> Optional[Dict[str, Any]]:
+        """
+        Start a tracking run, or return the existing run for the same hour and date
+        
+        Args:
+            hour (int): Scheduled hour of the run (0-23)
+            run_date (date): Date of the scheduled run
+            
+        Returns:
+            Dict: Tracking run record or None on error
+        """
+        try:
+            query = """
+                INSERT INTO tracking_runs (scheduled_hour, run_date)
+                VALUES (%s, %s)
+                ON CONFLICT (scheduled_hour, run_date)
+                DO UPDATE SET scheduled_hour = EXCLUDED.scheduled_hour
+                RETURNING *
+            """
+            self.cursor.execute(query, (hour, run_date))
+            run = self.cursor.fetchone()
+            self.connection.commit()
+            
+            return dict(run) if run else None
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error starting tracking run: {e}")
+            self.connection.rollback()
+            return None
+    
+    def get_run_checkpoints(self, run_id: int) -> set:
+        """
+        Get the channels already completed in a tracking run
+        
+        Args:
+            run_id (int): Tracking run ID
+            
+        Returns:
+            set: Completed channel tracking IDs
+        """
+        try:
+            query = """
+                SELECT channel_tracking_id FROM tracking_run_checkpoints
+                WHERE run_id = %s
+            """
+            self.cursor.execute(query, (run_id,))
+            
+            return {row['channel_tracking_id'] for row in self.cursor.fetchall()}
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching run checkpoints: {e}")
+            self.connection.rollback()
+            return set()
+    
+    def mark_channel_checkpoint(self, run_id: int, channel_id: str, success: bool, duration_seconds: Optional[float] = None) -> bool:
+        """
+        Record that a channel has been completed in a tracking run
+        
+        Args:
+            run_id (int): Tracking run ID
+            channel_id (str): Channel tracking ID
+            success (bool): Whether the channel was processed successfully
+            duration_seconds (float, optional): Time spent processing the channel
+            
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            query = """
+                INSERT INTO tracking_run_checkpoints (run_id, channel_tracking_id, success, duration_seconds)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (run_id, channel_tracking_id) DO NOTHING
+            """
+            self.cursor.execute(query, (run_id, channel_id, success, duration_seconds))
+            self.connection.commit()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error recording run checkpoint: {e}")
+            self.connection.rollback()
+            return False
+    
+    def finish_tracking_run(self, run_id: int) -> bool:
+        """
+        Mark a tracking run as completed
+        
+        Args:
+            run_id (int): Tracking run ID
+            
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            query = """
+                UPDATE tracking_runs 
+                SET status = 'completed',
+                    finished_at = %s
+                WHERE id = %s
+            """
+            self.cursor.execute(query, (datetime.now(config.TIMEZONE), run_id))
+            self.connection.commit()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error finishing tracking run: {e}")
+            self.connection.rollback()
+            return False
+    
+    def get_unfinished_runs(self, max_age_hours: int) -> List[Dict[str, Any]]:
+        """
+        Get tracking runs that were interrupted before completing
+        
+        Args:
+            max_age_hours (int): Only return runs started within this many hours
+            
+        Returns:
+            List[Dict]: Unfinished tracking run records
+        """
+        try:
+            query = """
+                SELECT * FROM tracking_runs
+                WHERE status = 'running'
+                AND started_at > %s
+                ORDER BY started_at ASC
+            """
+            since = datetime.now(config.TIMEZONE) - timedelta(hours=max_age_hours)
+            self.cursor.execute(query, (since,))
+            
+            return [dict(run) for run in self.cursor.fetchall()]
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching unfinished runs: {e}")
+            self.connection.rollback()
+            return []
+    
+    def get_channel_costs(self, history_days: int) -> List[Dict[str, Any]]:
+        """
+        Get active channels with their average processing time from recent runs
+        
+        Args:
+            history_days (int): Number of days of run checkpoints to average over
+            
+        Returns:
+            List[Dict]: Channel tracking records with an avg_duration_seconds field
+        """
+        try:
+            query = """
+                SELECT 
+                    ct.id, ct.channel_name, ct.channel_url, ct.youtube_channel_id,
+                    ct.user_id, ct.scheduled_hour, ct.allow_rebalance,
+                    AVG(cp.duration_seconds) as avg_duration_seconds
+                FROM channel_tracking ct
+                LEFT JOIN tracking_run_checkpoints cp 
+                    ON cp.channel_tracking_id = ct.id
+                    AND cp.completed_at > %s
+                WHERE ct.is_active = true
+                GROUP BY ct.id
+            """
+            since = datetime.now(config.TIMEZONE) - timedelta(days=history_days)
+            self.cursor.execute(query, (since,))
+            
+            return [dict(channel) for channel in self.cursor.fetchall()]
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching channel costs: {e}")
+            self.connection.rollback()
+            return []
+    
+    def update_scheduled_hours(self, assignments: Dict[Any, int]) -> int:
+        """
+        Move opted-in channels to new scheduled hours
+        
+        Args:
+            assignments (Dict): New scheduled hour by channel tracking ID
+            
+        Returns:
+            int: Number of channels updated
+        """
+        try:
+            query = """
+                UPDATE channel_tracking 
+                SET scheduled_hour = %s
+                WHERE id = %s AND allow_rebalance = true
+            """
+            updated = 0
+            for channel_id, hour in assignments.items():
+                self.cursor.execute(query, (hour, channel_id))
+                updated += self.cursor.rowcount
+            
+            self.connection.commit()
+            return updated
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error updating scheduled hours: {e}")
+            self.connection.rollback()
+            return 0
+    
+    def get_backfill_state(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the backfill cursor of a channel, creating it on first use
+        
+        Args:
+            channel_id (str): Channel tracking ID
+            
+        Returns:
+            Dict: Backfill state record or None on error
+        """
+        try:
+            query = """
+                INSERT INTO channel_backfill_state (channel_tracking_id)
+                VALUES (%s)
+                ON CONFLICT (channel_tracking_id)
+                DO UPDATE SET channel_tracking_id = EXCLUDED.channel_tracking_id
+                RETURNING *
+            """
+            self.cursor.execute(query, (channel_id,))
+            state = self.cursor.fetchone()
+            self.connection.commit()
+            
+            return dict(state) if state else None
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching backfill state: {e}")
+            self.connection.rollback()
+            return None
+    
+    def save_backfill_state(self, channel_id: str, next_index: int, videos_listed: int, videos_queued: int, completed: bool) -> bool:
+        """
+        Advance the backfill cursor of a channel
+        
+        Args:
+            channel_id (str): Channel tracking ID
+            next_index (int): 1-based index of the next video to list
+            videos_listed (int): Videos listed since the last save
+            videos_queued (int): Downloads queued since the last save
+            completed (bool): Whether the end of the channel was reached
+            
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            query = """
+                UPDATE channel_backfill_state 
+                SET next_index = %s,
+                    videos_listed = videos_listed + %s,
+                    videos_queued = videos_queued + %s,
+                    completed = %s,
+                    updated_at = %s
+                WHERE channel_tracking_id = %s
+            """
+            self.cursor.execute(query, (
+                next_index,
+                videos_listed,
+                videos_queued,
+                completed,
+                datetime.now(config.TIMEZONE),
+                channel_id
+            ))
+            self.connection.commit()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error saving backfill state: {e}")
+            self.connection.rollback()
+            return False
+    
+    def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get user information by ID
+        
+        Args:
+            user_id (str): User ID
+            
+        Returns:
+            Dict: User information or None if not found
+        """
+        try:
+            query = "SELECT * FROM users WHERE id = %s"
+            self.cursor.execute(query, (user_id,))
+            user = self.cursor.fetchone()
+            
+            return dict(user) if user else None
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching user: {e}")
+            return None
+    
+    def check_video_exists(self, youtube_id: str) -> bool:
+        """
+        Check if a video is already in the library
+        
+        The backend keeps one record per youtube_id, whichever user it was
+        downloaded for.
+        
+        Args:
+            youtube_id (str): YouTube video ID
+            
+        Returns:
+            bool: True if video exists
+        """
+        try:
+            query = """
+                SELECT 1 FROM videos 
+                WHERE youtube_id = %s
+                LIMIT 1
+            """
+            self.cursor.execute(query, (youtube_id,))
+            result = self.cursor.fetchone()
+            
+            return result is not None
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error checking video existence: {e}")
+            return False
+    
+    def get_existing_videos(self, youtube_ids: List[str]) -> set:
+        """
+        Check in bulk which videos are already in the library
+        
+        Args:
+            youtube_ids (List[str]): YouTube video IDs
+            
+        Returns:
+            set: YouTube video IDs that already exist
+        """
+        if not youtube_ids:
+            return set()
+        
+        try:
+            query = """
+                SELECT youtube_id FROM videos 
+                WHERE youtube_id = ANY(%s)
+            """
+            self.cursor.execute(query, (list(youtube_ids),))
+            
+            return {row['youtube_id'] for row in self.cursor.fetchall()}
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error checking video existence: {e}")
+            self.connection.rollback()
+            return set()
+    
+    def get_channel_stats(self) -> Dict[str, Any]:
+        """
+        Get overall channel tracking statistics
+        
+        Returns:
+            Dict: Statistics summary
+        """
+        try:
+            query = """
+                SELECT 
+                    COUNT(*) as total_channels,
+                    COUNT(*) FILTER (WHERE is_active = true) as active_channels,
+                    COUNT(*) FILTER (WHERE error_count > 0) as channels_with_errors,
+                    SUM(total_videos_found) as total_videos_found,
+                    SUM(total_videos_downloaded) as total_videos_downloaded,
+                    AVG(total_videos_downloaded::float / NULLIF(total_videos_found, 0)) as avg_success_rate
+                FROM channel_tracking
+            """
+            self.cursor.execute(query)
+            stats = self.cursor.fetchone()
+            
+            return dict(stats) if stats else {}
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error fetching channel stats: {e}")
+            return {}
+    
+    def get_cached_channel_stats(self) -> Dict[str, Any]:
+        """
+        Get channel tracking statistics from the incrementally maintained stats table
+        
+        Falls back to the full aggregate in get_channel_stats() when the stats
+        table has not been created yet.
+        
+        Returns:
+            Dict: Statistics summary
+        """
+        try:
+            query = """
+                SELECT 
+                    total_channels,
+                    active_channels,
+                    channels_with_errors,
+                    total_videos_found,
+                    total_videos_downloaded,
+                    success_rate_sum / NULLIF(success_rate_count, 0) as avg_success_rate,
+                    updated_at
+                FROM channel_tracking_stats
+                WHERE id = 1
+            """
+            self.cursor.execute(query)
+            stats = self.cursor.fetchone()
+            
+            if stats:
+                return dict(stats)
+            
+        except psycopg2.Error as e:
+            logger.warning(f"⚠️ Stats table unavailable, falling back to full aggregate: {e}")
+            self.connection.rollback()
+        
+        return self.get_channel_stats()
+    
+    def run_migrations(self) -> List[str]:
+        """
+        Apply pending SQL migrations from the migrations directory
+        
+        Each migration runs in its own transaction and is recorded in
+        tracker_schema_migrations so it is applied only once.
+        
+        Returns:
+            List[str]: Names of the migrations applied in this call
+        """
+        applied_now = []
+        
+        try:
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tracker_schema_migrations (
+                    version VARCHAR(255) PRIMARY KEY,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            self.connection.commit()
+            
+            self.cursor.execute("SELECT version FROM tracker_schema_migrations")
+            applied = {row['version'] for row in self.cursor.fetchall()}
+            
+            for filename in sorted(os.listdir(config.MIGRATIONS_PATH)):
+                if not filename.endswith('.sql') or filename in applied:
+                    continue
+                
+                logger.info(f"🛠️ Applying migration {filename}")
+                
+                with open(os.path.join(config.MIGRATIONS_PATH, filename), encoding='utf-8') as f:
+                    self.cursor.execute(f.read())
+                
+                self.cursor.execute(
+                    "INSERT INTO tracker_schema_migrations (version) VALUES (%s)",
+                    (filename,)
+                )
+                self.connection.commit()
+                applied_now.append(filename)
+            
+            return applied_now
+            
+        except (psycopg2.Error, OSError) as e:
+            logger.error(f"❌ Error applying migrations: {e}")
+            self.connection.rollback()
+            raise
+    
+    def cleanup_old_logs(self, days_to_keep: int = 30) -> int:
+        """
+        Clean up old tracking logs (if implemented)
+        
+        Args:
+            days_to_keep (int): Number of days of logs to keep
+            
+        Returns:
+            int: Number of records cleaned up
+        """
+        # This would be implemented if we had a separate logs table
+        # For now, just return 0
+        return 0
+
+class SynchronizedDatabase:
+    """Serializes calls into a DatabaseManager shared by several threads"""
+    
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.lock = threading.RLock()
+    
+    def __getattr__(self, name: str):
+        attribute = getattr(self.db, name)
+        if not callable(attribute):
+            return attribute
+        
+        # One connection and cursor: statements and their commits must not interleave
+        def synchronized(*args, **kwargs):
+            with self.lock:
+                return attribute(*args, **kwargs)
+        
+        return synchronized
+
+# Global database manager instance
 db_manager = DatabaseManager()
\ No newline at end of file
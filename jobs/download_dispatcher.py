@@ -0,0 +1,220 @@
+"""
+Download Dispatcher Module for XandTube Channel Tracking Jobs
+Keeps the number of in-flight backend downloads bounded and reports real completions
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from adaptive_limiter import call_api
+from config import config
+from trace_recorder import recorder
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class DownloadDispatcher:
+    """Tracks backend downloads by polling their progress and applies backpressure"""
+
+    def __init__(self, session: Optional[requests.Session] = None, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            session (requests.Session, optional): HTTP session used to reach the backend
+                API, defaults to one authenticated with API_TOKEN
+            max_in_flight (int, optional): Maximum downloads queued on the backend at once
+        """
+        if session is None:
+            session = requests.Session()
+            if config.API_TOKEN:
+                session.headers['Authorization'] = f"Bearer {config.API_TOKEN}"
+
+        self.session = session
+        self.max_in_flight = max_in_flight or config.DOWNLOAD_QUEUE_DEPTH
+        self.in_flight: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.settled = threading.Condition(self.lock)
+        self.poller: Optional[threading.Thread] = None
+
+    def wait_for_slot(self, deadline: Optional[float] = None) -> bool:
+        """
+        Block until fewer than max_in_flight downloads are pending on the backend
+
+        Args:
+            deadline (float, optional): time.monotonic() after which to stop waiting
+
+        Returns:
+            bool: True if a slot is free, False if the deadline passed first
+        """
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+
+        with self.settled:
+            return self.settled.wait_for(lambda: len(self.in_flight) < self.max_in_flight, timeout)
+
+    def track(self, download_id: str, label: str, on_complete: Callable[[], None], on_error: Callable[[str], None], owner: Any = None):
+        """
+        Start tracking a download accepted by the backend
+
+        Args:
+            download_id (str): Download ID returned by the backend
+            label (str): Description for logging
+            on_complete (Callable): Called once the backend finished the download
+            on_error (Callable): Called with an error message if the download failed
+            owner: Tracker that submitted the download, for drain() and abandon()
+        """
+        with self.lock:
+            self.in_flight[download_id] = {
+                'label': label,
+                'owner': owner,
+                'submitted_at': time.monotonic(),
+                'on_complete': on_complete,
+                'on_error': on_error
+            }
+
+            if self.poller is None:
+                self.poller = threading.Thread(target=self.poll_loop, name='download-poller', daemon=True)
+                self.poller.start()
+
+    def poll_loop(self):
+        """Poll in-flight downloads until there are none left"""
+        try:
+            while True:
+                time.sleep(config.DOWNLOAD_POLL_INTERVAL)
+
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error("❌ Polling backend downloads failed: %s", e)
+
+                with self.lock:
+                    if not self.in_flight:
+                        return
+
+        finally:
+            # Whatever ends this thread, let the next track() start a new poller
+            with self.lock:
+                if self.poller is threading.current_thread():
+                    self.poller = None
+
+    def poll(self):
+        """Check the progress of every in-flight download and settle finished ones"""
+        with self.lock:
+            downloads = list(self.in_flight.items())
+
+        # One request per download: made without the lock so submitters aren't held up
+        for download_id, download in downloads:
+            status, error = self.fetch_status(download_id)
+            age = time.monotonic() - download['submitted_at']
+
+            if status not in ('completed', 'error') and age <= config.DOWNLOAD_MAX_WAIT_SECONDS:
+                continue
+
+            with self.lock:
+                # Abandoned while its status was being fetched
+                if download_id not in self.in_flight:
+                    continue
+
+            try:
+                if status == 'completed':
+                    recorder.record('download', download_id=download_id, latency=age, status=status)
+                    logger.info("✅ Download completed: %s", download['label'])
+                    download['on_complete']()
+
+                elif status == 'error':
+                    recorder.record('download', download_id=download_id, latency=age, status=status)
+                    logger.warning("⚠️ Download failed: %s - %s", download['label'], error)
+                    download['on_error'](error or 'Download failed')
+
+                else:
+                    logger.warning("⏰ Gave up waiting for download: %s", download['label'])
+                    download['on_error'](f"No completion after {config.DOWNLOAD_MAX_WAIT_SECONDS} seconds")
+
+            except Exception as e:
+                # e.g. the owner's database connection closed after abandon()
+                logger.error("❌ Error settling download %s: %s", download['label'], e)
+
+            finally:
+                # Release the slot only once the callbacks ran, so drain() returns
+                # with the run's counters final
+                with self.lock:
+                    self.in_flight.pop(download_id, None)
+                    self.settled.notify_all()
+
+    def fetch_status(self, download_id: str):
+        """
+        Fetch the backend status of a download
+
+        Args:
+            download_id (str): Download ID returned by the backend
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: Status and error message; status is
+            None when it could not be determined
+        """
+        try:
+            response = call_api(
+                self.session,
+                'get',
+                f"{config.API_BASE_URL}/download/progress/{download_id}",
+                timeout=config.API_TIMEOUT
+            )
+            # Progress lives in the backend's memory and is lost when it restarts
+            if response.status_code == 404:
+                return 'error', 'Download unknown to the backend (restarted?)'
+            if response.status_code != 200:
+                return None, None
+
+            progress = response.json()
+            return progress.get('status'), progress.get('error')
+
+        except (requests.RequestException, ValueError) as e:
+            logger.debug("Could not fetch progress for %s: %s", download_id, e)
+            return None, None
+
+    def pending(self, owner: Any = None) -> int:
+        """Number of in-flight downloads submitted by owner"""
+        return sum(1 for download in self.in_flight.values() if download['owner'] is owner)
+
+    def drain(self, timeout: float, owner: Any = None) -> int:
+        """
+        Wait for in-flight downloads of one owner to finish
+
+        Args:
+            timeout (float): Maximum seconds to wait
+            owner: Tracker whose downloads to wait for
+
+        Returns:
+            int: Number of downloads still pending when the wait ended
+        """
+        deadline = time.monotonic() + timeout
+
+        with self.settled:
+            while True:
+                pending = self.pending(owner)
+                remaining = deadline - time.monotonic()
+
+                if not pending or remaining <= 0:
+                    return pending
+
+                logger.info(f"⏳ Waiting for {pending} backend download(s) to finish")
+                self.settled.wait(min(remaining, config.DOWNLOAD_POLL_INTERVAL))
+
+    def abandon(self, owner: Any = None):
+        """
+        Stop tracking the in-flight downloads of one owner without settling them
+
+        Args:
+            owner: Tracker whose downloads to drop
+        """
+        with self.lock:
+            for download_id, download in list(self.in_flight.items()):
+                if download['owner'] is owner:
+                    del self.in_flight[download_id]
+            self.settled.notify_all()
+
+# Process-wide dispatcher, so DOWNLOAD_QUEUE_DEPTH bounds scheduled runs and
+# immediate checks together
+download_dispatcher = DownloadDispatcher()
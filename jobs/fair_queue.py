@@ -0,0 +1,121 @@
+"""
+Fair Queue Module for XandTube Channel Tracking Jobs
+Weighted fair queuing of channel checks across the users that own them
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple
+
+class FairShareQueue:
+    """Hands out work so every user receives service in proportion to their weight"""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, max_running_per_user: int = 0, default_cost: float = 1.0):
+        """
+        Args:
+            weights (Dict[str, float], optional): Share weight per user ID, 1.0 if missing
+            max_running_per_user (int): Items of one user running at once, 0 for no limit
+            default_cost (float): Cost charged for an item before any item completed
+        """
+        self.weights = weights or {}
+        self.max_running_per_user = max_running_per_user
+        self.default_cost = default_cost
+        self.lock = threading.Lock()
+
+        self.queues: Dict[str, Deque[Hashable]] = {}
+        self.items: Dict[Hashable, Dict[str, Any]] = {}
+        self.virtual_time: Dict[str, float] = {}
+        self.running: Dict[str, int] = {}
+        self.completed_cost = 0.0
+        self.completed_count = 0
+
+    def __len__(self) -> int:
+        with self.lock:
+            return sum(1 for entry in self.items.values() if not entry['taken'])
+
+    def push(self, key: Hashable, item: Any, owners: List[Any]):
+        """
+        Queue an item owned by one or more users
+
+        Items shared by several users are queued for each of them, dispatched
+        through whichever owner is served first, and charged to all owners.
+
+        Args:
+            key (Hashable): Unique key of the item
+            item: Item to hand out
+            owners (List): User IDs the item serves
+        """
+        owners = list(dict.fromkeys(str(owner) for owner in owners))
+
+        with self.lock:
+            self.items[key] = {'item': item, 'owners': owners, 'taken': False, 'charged': 0.0}
+            for owner in owners:
+                self.queues.setdefault(owner, deque()).append(key)
+                self.virtual_time.setdefault(owner, 0.0)
+                self.running.setdefault(owner, 0)
+
+    def pop(self) -> Optional[Tuple[Hashable, Any]]:
+        """
+        Take the next item of the user with the least weighted service so far
+
+        Returns:
+            Tuple: Key and item, or None if nothing can run right now
+        """
+        with self.lock:
+            for owner in sorted(self.queues, key=lambda user: self.virtual_time[user]):
+                queue = self.queues[owner]
+
+                # Items shared with another owner may already have been dispatched
+                while queue and (queue[0] not in self.items or self.items[queue[0]]['taken']):
+                    queue.popleft()
+                if not queue:
+                    continue
+                if self.max_running_per_user and self.running[owner] >= self.max_running_per_user:
+                    continue
+
+                key = queue.popleft()
+                entry = self.items[key]
+                entry['taken'] = True
+                entry['charged'] = self.estimated_cost()
+                self.charge(entry['owners'], entry['charged'])
+
+                for user in entry['owners']:
+                    self.running[user] += 1
+
+                return key, entry['item']
+
+            return None
+
+    def complete(self, key: Hashable, cost: float):
+        """
+        Settle a dispatched item with its measured cost
+
+        Args:
+            key (Hashable): Key of the dispatched item
+            cost (float): Measured cost, e.g. seconds spent
+        """
+        with self.lock:
+            entry = self.items.pop(key)
+            self.charge(entry['owners'], cost - entry['charged'])
+            self.completed_cost += cost
+            self.completed_count += 1
+
+            for user in entry['owners']:
+                self.running[user] -= 1
+
+    def remaining(self) -> List[Any]:
+        """Items that were never dispatched"""
+        with self.lock:
+            return [entry['item'] for entry in self.items.values() if not entry['taken']]
+
+    def charge(self, owners: List[str], cost: float):
+        """Split a cost across owners, scaled by their weights"""
+        share = cost / len(owners)
+        for owner in owners:
+            self.virtual_time[owner] += share / self.weights.get(owner, 1.0)
+
+    def estimated_cost(self) -> float:
+        """Average cost of the items completed so far"""
+        if not self.completed_count:
+            return self.default_cost
+        return self.completed_cost / self.completed_count
@@ -0,0 +1,136 @@
+"""
+Health Endpoint Module for XandTube Channel Tracking Jobs
+Exposes liveness/readiness probes and controller metrics over HTTP for systemd/docker deployments
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+from adaptive_limiter import limiters
+from config import config
+from database import DatabaseManager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """Serves /healthz (liveness), /readyz (readiness) and /metrics (Prometheus text)"""
+
+    # Set by HealthServer before the HTTP server starts
+    scheduler = None
+
+    def do_GET(self):
+        """Handle probe requests"""
+        if self.path == '/metrics':
+            self.send_payload(200, self.metrics().encode('utf-8'), 'text/plain; version=0.0.4')
+            return
+
+        if self.path == '/healthz':
+            status, body = self.liveness()
+        elif self.path == '/readyz':
+            status, body = self.readiness()
+        else:
+            status, body = 404, {'status': 'not_found'}
+
+        self.send_payload(status, json.dumps(body, default=str).encode('utf-8'), 'application/json')
+
+    def send_payload(self, status: int, payload: bytes, content_type: str):
+        """Write a complete response"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def liveness(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Report whether the scheduler loop is running
+
+        Returns:
+            Tuple[int, Dict]: HTTP status and response body
+        """
+        if self.scheduler is not None and self.scheduler.is_running:
+            return 200, {'status': 'ok'}
+        return 503, {'status': 'stopped'}
+
+    def readiness(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Report whether the database is reachable, with the cached statistics
+
+        Returns:
+            Tuple[int, Dict]: HTTP status and response body
+        """
+        db = DatabaseManager()
+
+        if not db.connect():
+            return 503, {'status': 'database_unavailable'}
+
+        try:
+            return 200, {'status': 'ok', 'stats': db.get_cached_channel_stats()}
+        finally:
+            db.disconnect()
+
+    def metrics(self) -> str:
+        """
+        Render the adaptive concurrency controllers in Prometheus text format
+
+        Returns:
+            str: Exposition text
+        """
+        samples = {
+            'tracker_concurrency_limit': ('gauge', 'Current adaptive concurrency limit', []),
+            'tracker_concurrency_in_flight': ('gauge', 'Operations currently running', []),
+            'tracker_calls_total': ('counter', 'Completed operations by outcome', []),
+            'tracker_concurrency_decisions_total': ('counter', 'Limit changes by direction', []),
+        }
+
+        for limiter in limiters:
+            snapshot = limiter.snapshot()
+            controller = f'controller="{snapshot["name"]}"'
+
+            samples['tracker_concurrency_limit'][2].append((controller, snapshot['limit']))
+            samples['tracker_concurrency_in_flight'][2].append((controller, snapshot['in_flight']))
+            for outcome, count in snapshot['totals'].items():
+                samples['tracker_calls_total'][2].append((f'{controller},outcome="{outcome}"', count))
+            samples['tracker_concurrency_decisions_total'][2].append((f'{controller},direction="increase"', snapshot['increases']))
+            samples['tracker_concurrency_decisions_total'][2].append((f'{controller},direction="decrease"', snapshot['decreases']))
+
+        lines = []
+        for name, (metric_type, description, values) in samples.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in values)
+
+        return '\n'.join(lines) + '\n'
+
+    def log_message(self, format, *args):
+        """Route access logs through the module logger at debug level"""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+class HealthServer:
+    """Background HTTP server for health probes"""
+
+    def __init__(self, scheduler, host: str = None, port: int = None):
+        self.scheduler = scheduler
+        self.host = host or config.HEALTH_SERVER_HOST
+        self.port = port or config.HEALTH_SERVER_PORT
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """Start serving probes in a daemon thread"""
+        handler = type('BoundHealthRequestHandler', (HealthRequestHandler,), {'scheduler': self.scheduler})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='health-server', daemon=True)
+        self.thread.start()
+        logger.info(f"💓 Health endpoint listening on http://{self.host}:{self.port} (/healthz, /readyz, /metrics)")
+
+    def stop(self):
+        """Stop the HTTP server"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -0,0 +1,177 @@
+"""
+Logging Setup Module for XandTube Channel Tracking Jobs
+Non-blocking logging through a background writer, with optional JSON output and per-channel sampling
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Sequence
+
+from config import config
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+
+        channel = getattr(record, 'channel', None)
+        if channel is not None:
+            entry['channel'] = channel
+
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class ChannelSamplingFilter(logging.Filter):
+    """Samples verbose records tagged with a channel so one busy channel can't flood the log"""
+
+    def __init__(self, keep_first: int, keep_every: int, window_seconds: float):
+        """
+        Args:
+            keep_first (int): Verbose records kept per channel and window
+            keep_every (int): After that, keep one record in this many (0 drops the rest)
+            window_seconds (float): How often the per-channel counts start over
+        """
+        super().__init__()
+        self.keep_first = keep_first
+        self.keep_every = keep_every
+        self.window_seconds = window_seconds
+        self.window_started_at = time.monotonic()
+        self.counts: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        channel = getattr(record, 'channel', None)
+
+        # Warnings, errors and untagged records are never sampled
+        if channel is None or record.levelno > logging.INFO:
+            return True
+
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_started_at >= self.window_seconds:
+                self.counts.clear()
+                self.window_started_at = now
+
+            count = self.counts.get(channel, 0) + 1
+            self.counts[channel] = count
+
+        if count <= self.keep_first:
+            return True
+        return bool(self.keep_every) and (count - self.keep_first) % self.keep_every == 0
+
+class DeferredQueueHandler(QueueHandler):
+    """Queues records unformatted so message formatting happens in the writer thread"""
+
+    def __init__(self, log_queue: queue.Queue, direct_handlers: Sequence[logging.Handler] = ()):
+        """
+        Args:
+            log_queue (queue.Queue): Queue the background writer reads from
+            direct_handlers (Sequence[logging.Handler]): Handlers that take warnings
+                and errors from the calling thread while the queue is full
+        """
+        super().__init__(log_queue)
+        self.direct_handlers = list(direct_handlers)
+        self.dropped = 0
+        self.dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process: no need to flatten args for pickling
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.dropped and not self.queue.full():
+            self.report_dropped()
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if record.levelno >= logging.WARNING:
+            # Warnings and errors are never dropped: write them from this thread instead
+            for handler in self.direct_handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        else:
+            # Never block the caller on verbose records: drop them while the writer falls behind
+            with self.dropped_lock:
+                self.dropped += 1
+
+    def report_dropped(self):
+        """Log how many records were dropped since the last report"""
+        with self.dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+
+        if dropped:
+            self.handle(logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "⚠️ Log queue full, dropped %d record(s)", (dropped,), None
+            ))
+
+# Background writer, started once per process by setup_logging()
+listener: Optional[QueueListener] = None
+
+def setup_logging():
+    """
+    Route all logging through a queue to a background writer
+
+    The writer owns the size-rotated log file and stdout. LOG_JSON=true
+    switches both to one JSON object per line. Safe to call more than once.
+    """
+    global listener
+
+    if listener is not None:
+        return
+
+    log_dir = os.path.dirname(config.LOG_FILE)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = JsonFormatter() if config.LOG_JSON else logging.Formatter(config.LOG_FORMAT)
+
+    file_handler = RotatingFileHandler(
+        config.LOG_FILE,
+        maxBytes=config.LOG_MAX_BYTES,
+        backupCount=config.LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    queue_handler = DeferredQueueHandler(log_queue, (file_handler, stream_handler))
+    queue_handler.addFilter(ChannelSamplingFilter(
+        config.LOG_SAMPLE_FIRST,
+        config.LOG_SAMPLE_EVERY,
+        config.LOG_SAMPLE_WINDOW_SECONDS
+    ))
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, config.LOG_LEVEL))
+    root_logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+
+    # Flush queued records on exit, after reporting any that were dropped
+    atexit.register(listener.stop)
+    atexit.register(queue_handler.report_dropped)
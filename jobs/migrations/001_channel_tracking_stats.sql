@@ -0,0 +1,89 @@
+-- Incrementally maintained channel tracking statistics
+-- A single-row table kept in sync by a trigger on channel_tracking, so the
+-- hourly health check reads one row instead of aggregating the whole table.
+
+CREATE TABLE IF NOT EXISTS channel_tracking_stats (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_channels BIGINT NOT NULL DEFAULT 0,
+    active_channels BIGINT NOT NULL DEFAULT 0,
+    channels_with_errors BIGINT NOT NULL DEFAULT 0,
+    total_videos_found BIGINT NOT NULL DEFAULT 0,
+    total_videos_downloaded BIGINT NOT NULL DEFAULT 0,
+    success_rate_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    success_rate_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Add (sign = 1) or remove (sign = -1) one row's contribution to the counters
+CREATE OR REPLACE FUNCTION channel_tracking_stats_add(r channel_tracking, sign INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE channel_tracking_stats SET
+        total_channels = total_channels + sign,
+        active_channels = active_channels + CASE WHEN r.is_active THEN sign ELSE 0 END,
+        channels_with_errors = channels_with_errors + CASE WHEN r.error_count > 0 THEN sign ELSE 0 END,
+        total_videos_found = total_videos_found + sign * COALESCE(r.total_videos_found, 0),
+        total_videos_downloaded = total_videos_downloaded + sign * COALESCE(r.total_videos_downloaded, 0),
+        success_rate_sum = success_rate_sum + CASE
+            WHEN COALESCE(r.total_videos_found, 0) > 0
+            THEN sign * (COALESCE(r.total_videos_downloaded, 0)::float / r.total_videos_found)
+            ELSE 0
+        END,
+        success_rate_count = success_rate_count + CASE
+            WHEN COALESCE(r.total_videos_found, 0) > 0 THEN sign
+            ELSE 0
+        END,
+        updated_at = NOW()
+    WHERE id = 1;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION channel_tracking_stats_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM channel_tracking_stats_add(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM channel_tracking_stats_add(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Seed the counters while writers are blocked, then keep them up to date
+LOCK TABLE channel_tracking IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO channel_tracking_stats (
+    id, total_channels, active_channels, channels_with_errors,
+    total_videos_found, total_videos_downloaded,
+    success_rate_sum, success_rate_count, updated_at
+)
+SELECT
+    1,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE is_active = true),
+    COUNT(*) FILTER (WHERE error_count > 0),
+    COALESCE(SUM(total_videos_found), 0),
+    COALESCE(SUM(total_videos_downloaded), 0),
+    COALESCE(SUM(total_videos_downloaded::float / NULLIF(total_videos_found, 0)), 0),
+    COUNT(*) FILTER (WHERE total_videos_found > 0),
+    NOW()
+FROM channel_tracking
+ON CONFLICT (id) DO UPDATE SET
+    total_channels = EXCLUDED.total_channels,
+    active_channels = EXCLUDED.active_channels,
+    channels_with_errors = EXCLUDED.channels_with_errors,
+    total_videos_found = EXCLUDED.total_videos_found,
+    total_videos_downloaded = EXCLUDED.total_videos_downloaded,
+    success_rate_sum = EXCLUDED.success_rate_sum,
+    success_rate_count = EXCLUDED.success_rate_count,
+    updated_at = EXCLUDED.updated_at;
+
+DROP TRIGGER IF EXISTS channel_tracking_stats_sync ON channel_tracking;
+
+-- last_check-only updates leave the counters untouched, so skip them
+CREATE TRIGGER channel_tracking_stats_sync
+AFTER INSERT OR DELETE OR UPDATE OF is_active, error_count, total_videos_found, total_videos_downloaded
+ON channel_tracking
+FOR EACH ROW EXECUTE FUNCTION channel_tracking_stats_trigger();
@@ -0,0 +1,19 @@
+-- Notify the tracker when a channel starts being tracked
+-- The scheduler LISTENs on channel_tracking_changed and checks the channel
+-- right away instead of waiting for its next scheduled hour.
+
+CREATE OR REPLACE FUNCTION channel_tracking_notify_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.is_active AND (TG_OP = 'INSERT' OR NOT COALESCE(OLD.is_active, false)) THEN
+        PERFORM pg_notify('channel_tracking_changed', NEW.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS channel_tracking_notify ON channel_tracking;
+
+CREATE TRIGGER channel_tracking_notify
+AFTER INSERT OR UPDATE OF is_active ON channel_tracking
+FOR EACH ROW EXECUTE FUNCTION channel_tracking_notify_trigger();
@@ -0,0 +1,26 @@
+-- Checkpoints for resumable tracking runs
+-- Each scheduled run is identified by its hour and date; every channel that
+-- finishes is checkpointed so a restarted process only handles the rest.
+
+CREATE TABLE IF NOT EXISTS tracking_runs (
+    id SERIAL PRIMARY KEY,
+    scheduled_hour INTEGER NOT NULL,
+    run_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    UNIQUE (scheduled_hour, run_date)
+);
+
+CREATE TABLE IF NOT EXISTS tracking_run_checkpoints (
+    run_id INTEGER NOT NULL REFERENCES tracking_runs(id) ON DELETE CASCADE,
+    channel_tracking_id INTEGER NOT NULL,
+    success BOOLEAN NOT NULL,
+    duration_seconds DOUBLE PRECISION,
+    completed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (run_id, channel_tracking_id)
+);
+
+CREATE INDEX IF NOT EXISTS tracking_runs_unfinished_idx
+    ON tracking_runs (started_at)
+    WHERE status = 'running';
@@ -0,0 +1,5 @@
+-- Opt-in flag for the scheduled_hour rebalancer
+-- Only channels with allow_rebalance = true are ever moved to another hour.
+
+ALTER TABLE channel_tracking
+    ADD COLUMN IF NOT EXISTS allow_rebalance BOOLEAN NOT NULL DEFAULT false;
@@ -0,0 +1,12 @@
+-- Resumable back-catalog import cursor per tracked channel
+-- next_index is the 1-based playlist index of the first video not yet handled;
+-- it moves past each submitted video, so an interrupted chunk resumes mid-way.
+
+CREATE TABLE IF NOT EXISTS channel_backfill_state (
+    channel_tracking_id INTEGER PRIMARY KEY REFERENCES channel_tracking(id) ON DELETE CASCADE,
+    next_index INTEGER NOT NULL DEFAULT 1,
+    videos_listed INTEGER NOT NULL DEFAULT 0,
+    videos_queued INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT false,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
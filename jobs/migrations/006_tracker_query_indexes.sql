@@ -0,0 +1,14 @@
+-- Indexes for the queries in database.DatabaseManager
+-- test_query_plans.py verifies with EXPLAIN that each query uses them.
+
+-- get_active_channels_for_hour: active rows of one hour, least recently checked first
+CREATE INDEX IF NOT EXISTS channel_tracking_due_idx
+    ON channel_tracking (scheduled_hour, last_check ASC NULLS FIRST)
+    WHERE is_active = true;
+
+-- get_existing_videos / check_video_exists: served by the UNIQUE index the
+-- backend already has on videos.youtube_id (videos_youtube_id_key)
+
+-- get_channel_costs: only the last REBALANCE_HISTORY_DAYS of an ever-growing history
+CREATE INDEX IF NOT EXISTS tracking_run_checkpoints_completed_at_idx
+    ON tracking_run_checkpoints (completed_at);
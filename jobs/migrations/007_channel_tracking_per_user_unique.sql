@@ -0,0 +1,12 @@
+-- One tracking row per channel and user instead of per channel
+-- Lets several users track the same channel; the tracker enumerates it once
+-- per run and fans the result out to every subscriber (group_channels).
+-- The index name matches the one Sequelize derives from the backend model.
+
+ALTER TABLE channel_tracking
+    DROP CONSTRAINT IF EXISTS channel_tracking_youtube_channel_id_key;
+
+DROP INDEX IF EXISTS channel_tracking_youtube_channel_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS channel_tracking_youtube_channel_id_user_id
+    ON channel_tracking (youtube_channel_id, user_id);
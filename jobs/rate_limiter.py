@@ -0,0 +1,50 @@
+"""
+Rate Limiting Module for XandTube Channel Tracking Jobs
+Thread-safe token bucket used to pace requests to the upstream site
+"""
+
+import threading
+import time
+from typing import Optional
+
+class RateLimiter:
+    """Token bucket limiting how often an operation may start"""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        """
+        Args:
+            rate_per_second (float): Sustained number of operations per second
+            burst (int): Number of operations that may start back to back
+        """
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Block until an operation may start
+
+        Args:
+            deadline (float, optional): time.monotonic() after which to stop waiting
+
+        Returns:
+            bool: True if the operation may start, False if the deadline would pass first
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+
+                wait_seconds = (1 - self.tokens) / self.rate
+
+            if deadline is not None and time.monotonic() + wait_seconds > deadline:
+                return False
+
+            time.sleep(wait_seconds)
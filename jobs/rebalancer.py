@@ -0,0 +1,200 @@
+"""
+Schedule Rebalancer Module for XandTube Channel Tracking Jobs
+Evens out per-run load by moving opted-in channels between scheduled hours
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from config import config
+from database import DatabaseManager, db_manager
+from channel_tracker import tracker
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class ScheduleRebalancer:
+    """Proposes and applies scheduled_hour reassignments based on historical run cost"""
+
+    def __init__(self, db: Optional[DatabaseManager] = None):
+        self.db = db or db_manager
+
+    def build_plan(self) -> Dict[str, Any]:
+        """
+        Build a rebalancing plan from current channel placement and cost history
+
+        Channels tracking the same YouTube channel in the same hour are enumerated
+        once per run, so they are costed and moved together. Only groups whose rows
+        all opted in (allow_rebalance) are moved.
+
+        Returns:
+            Dict: Plan with per-hour load before/after and the proposed moves
+        """
+        channels = self.db.get_channel_costs(config.REBALANCE_HISTORY_DAYS)
+        hours = config.get_check_hours()
+
+        known_costs = sorted(
+            float(channel['avg_duration_seconds'])
+            for channel in channels
+            if channel['avg_duration_seconds'] is not None
+        )
+        default_cost = known_costs[len(known_costs) // 2] if known_costs else config.REBALANCE_DEFAULT_COST_SECONDS
+
+        # Group rows by (channel identity, hour): one enumeration per group per run
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for channel in channels:
+            key = (tracker.get_channel_group_key(channel), channel['scheduled_hour'])
+            group = groups.setdefault(key, {
+                'channel_key': key[0],
+                'channel_name': channel['channel_name'],
+                'hour': channel['scheduled_hour'],
+                'cost': 0.0,
+                'channel_ids': [],
+                'movable': True
+            })
+            cost = channel['avg_duration_seconds']
+            group['cost'] = max(group['cost'], float(cost) if cost is not None else default_cost)
+            group['channel_ids'].append(channel['id'])
+            group['movable'] = group['movable'] and bool(channel['allow_rebalance'])
+
+        load_before = self.compute_loads(groups.values(), hours)
+        unscheduled = [group for group in groups.values() if group['hour'] not in hours]
+        moves: List[Dict[str, Any]] = []
+
+        def move(group, to_hour):
+            moves.append({
+                'channel_name': group['channel_name'],
+                'channel_ids': list(group['channel_ids']),
+                'from_hour': group['hour'],
+                'to_hour': to_hour,
+                'cost': group['cost']
+            })
+            group['hour'] = to_hour
+
+        # Channels at hours without a run are never checked: bring opted-in ones in
+        loads = self.compute_loads(groups.values(), hours)
+        for group in sorted(unscheduled, key=lambda g: g['cost'], reverse=True):
+            if group['movable']:
+                to_hour = min(hours, key=lambda h: loads[h])
+                move(group, to_hour)
+                loads[to_hour] += group['cost']
+
+        # Repeatedly move the group that best narrows the gap between the
+        # busiest and the idlest run, until no move helps
+        for _ in range(len(groups) * len(hours)):
+            source = max(hours, key=lambda h: loads[h])
+            target = min(hours, key=lambda h: loads[h])
+            gap = loads[source] - loads[target]
+
+            occupied = {g['channel_key'] for g in groups.values() if g['hour'] == target}
+            candidates = [
+                g for g in groups.values()
+                if g['hour'] == source and g['movable'] and 0 < g['cost'] < gap
+                and g['channel_key'] not in occupied
+            ]
+            if not candidates:
+                break
+
+            group = min(candidates, key=lambda g: abs(gap / 2 - g['cost']))
+            move(group, target)
+            loads[source] -= group['cost']
+            loads[target] += group['cost']
+
+        return {
+            'hours': hours,
+            'load_before': load_before,
+            'load_after': self.compute_loads(groups.values(), hours),
+            'moves': moves,
+            'unscheduled': [g for g in unscheduled if not g['movable']],
+            'default_cost': default_cost
+        }
+
+    def compute_loads(self, groups, hours: List[int]) -> Dict[int, float]:
+        """
+        Sum the expected run duration for each scheduled hour
+
+        Args:
+            groups (Iterable[Dict]): Channel groups with hour and cost
+            hours (List[int]): Hours that have a scheduled run
+
+        Returns:
+            Dict[int, float]: Expected seconds of work per hour
+        """
+        loads = {hour: 0.0 for hour in hours}
+        for group in groups:
+            if group['hour'] in loads:
+                loads[group['hour']] += group['cost']
+        return loads
+
+    def apply_plan(self, plan: Dict[str, Any]) -> int:
+        """
+        Apply the moves of a plan to opted-in channels
+
+        Args:
+            plan (Dict): Plan returned by build_plan()
+
+        Returns:
+            int: Number of channel tracking rows updated
+        """
+        assignments = {
+            channel_id: planned_move['to_hour']
+            for planned_move in plan['moves']
+            for channel_id in planned_move['channel_ids']
+        }
+        if not assignments:
+            return 0
+
+        updated = self.db.update_scheduled_hours(assignments)
+        logger.info(f"⚖️ Rebalanced {updated} channels across {len(plan['hours'])} scheduled runs")
+        return updated
+
+    def format_report(self, plan: Dict[str, Any]) -> str:
+        """
+        Render a plan as a human-readable report
+
+        Args:
+            plan (Dict): Plan returned by build_plan()
+
+        Returns:
+            str: Report text
+        """
+        lines = [
+            "\n⚖️ Schedule Rebalance Report:",
+            "-" * 80,
+            f"{'Hour':<8}{'Before':>14}{'After':>14}",
+        ]
+        for hour in plan['hours']:
+            lines.append(
+                f"{hour:02d}:00   {self.format_duration(plan['load_before'][hour]):>14}"
+                f"{self.format_duration(plan['load_after'][hour]):>14}"
+            )
+
+        lines.append(
+            f"{'Max':<8}{self.format_duration(max(plan['load_before'].values(), default=0)):>14}"
+            f"{self.format_duration(max(plan['load_after'].values(), default=0)):>14}"
+        )
+        lines.append(f"\nChannels without history are assumed to take {plan['default_cost']:.0f}s")
+
+        if plan['moves']:
+            lines.append(f"\n📦 Proposed moves ({len(plan['moves'])}):")
+            for planned_move in plan['moves']:
+                lines.append(
+                    f"   {planned_move['channel_name']}: {planned_move['from_hour']:02d}:00 -> "
+                    f"{planned_move['to_hour']:02d}:00 (~{planned_move['cost']:.0f}s, "
+                    f"{len(planned_move['channel_ids'])} row(s))"
+                )
+        else:
+            lines.append("\n✅ No moves would improve the balance")
+
+        if plan['unscheduled']:
+            lines.append(f"\n⚠️ {len(plan['unscheduled'])} channel(s) are scheduled at hours without a run and did not opt in to rebalancing:")
+            for group in plan['unscheduled']:
+                lines.append(f"   {group['channel_name']} ({group['hour']:02d}:00)")
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        """Format seconds as H:MM:SS"""
+        seconds = int(round(seconds))
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
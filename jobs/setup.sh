@@ -78,7 +78,8 @@ echo ""
 echo "📋 Next steps:"
 echo "1. Edit .env file with your database credentials"
 echo "2. Ensure yt-dlp is installed: pip install yt-dlp"
-echo "3. Test the job: python3 scheduler.py --test-run"
-echo "4. Start the scheduler: python3 scheduler.py"
+echo "3. Apply database migrations: python3 scheduler.py --migrate"
+echo "4. Test the job: python3 scheduler.py --test-run"
+echo "5. Start the scheduler: python3 scheduler.py"
 echo ""
 echo "📚 For more information, see the documentation in README.md"
\ No newline at end of file
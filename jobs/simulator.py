@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Capacity Simulator for XandTube Channel Tracking Jobs
+Replays recorded runs (trace_recorder.py) in simulated time to project run duration and resource use
+"""
+
+import os
+import sys
+import json
+import heapq
+import argparse
+import itertools
+from collections import deque
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+# Add the jobs directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import config
+from fair_queue import FairShareQueue
+
+POLICIES = ['fifo', 'fair', 'longest-first']
+
+class Resource:
+    """Counting semaphore in simulated time that tracks utilization"""
+
+    def __init__(self, simulation: 'Simulation', name: str, capacity: int):
+        self.simulation = simulation
+        self.name = name
+        self.capacity = capacity
+        self.in_use = 0
+        self.peak = 0
+        self.waiters: deque = deque()
+        self.busy_time = 0.0
+        self.updated_at = 0.0
+
+    def account(self):
+        """Accumulate slot-seconds used since the last change"""
+        now = self.simulation.now
+        self.busy_time += self.in_use * (now - self.updated_at)
+        self.updated_at = now
+
+    def request(self, resume: Callable[[], None]):
+        """Take a slot now if one is free, otherwise queue for the next release"""
+        if self.in_use < self.capacity:
+            self.account()
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+            self.simulation.schedule(0, resume)
+        else:
+            self.waiters.append(resume)
+
+    def release(self):
+        """Hand the slot to the next waiter or free it"""
+        if self.waiters:
+            self.simulation.schedule(0, self.waiters.popleft())
+        else:
+            self.account()
+            self.in_use -= 1
+
+    def utilization(self) -> float:
+        """Average share of capacity in use over the simulated run"""
+        self.account()
+        if not self.simulation.now:
+            return 0.0
+        return self.busy_time / (self.capacity * self.simulation.now)
+
+class Simulation:
+    """Discrete-event loop driving generator processes"""
+
+    # Processes yield ('delay', seconds), ('acquire', resource),
+    # ('release', resource) or ('all', [processes])
+
+    def __init__(self):
+        self.now = 0.0
+        self.events: List[tuple] = []
+        self.sequence = itertools.count()
+
+    def schedule(self, delay: float, callback: Callable[[], None]):
+        heapq.heappush(self.events, (self.now + delay, next(self.sequence), callback))
+
+    def start(self, process: Generator, on_done: Optional[Callable[[], None]] = None):
+        """Start a process at the current simulated time"""
+        self.schedule(0, lambda: self.step(process, on_done))
+
+    def step(self, process: Generator, on_done: Optional[Callable[[], None]]):
+        """Run a process until it waits for something"""
+        while True:
+            try:
+                command, argument = next(process)
+            except StopIteration:
+                if on_done:
+                    on_done()
+                return
+
+            if command == 'delay':
+                self.schedule(argument, lambda: self.step(process, on_done))
+                return
+            if command == 'acquire':
+                argument.request(lambda: self.step(process, on_done))
+                return
+            if command == 'release':
+                argument.release()
+                continue
+            if command == 'all':
+                if not argument:
+                    continue
+                remaining = [len(argument)]
+
+                def child_done():
+                    remaining[0] -= 1
+                    if not remaining[0]:
+                        self.step(process, on_done)
+
+                for child in argument:
+                    self.start(child, child_done)
+                return
+
+            raise ValueError(f"Unknown simulation command: {command}")
+
+    def run(self):
+        """Process events until none are left"""
+        while self.events:
+            self.now, _, callback = heapq.heappop(self.events)
+            callback()
+
+def split_runs(path: str) -> Dict[str, Any]:
+    """
+    Split a recorded trace into its runs
+
+    The recorder appends, so one trace file collects every run recorded with
+    it. Events belong to the run started last and not yet ended; events of a
+    trace without run markers form a single run.
+
+    Args:
+        path (str): Trace file written with TRACE_RECORD_PATH
+
+    Returns:
+        Dict: 'runs' (label, duration and events, in recorded order) and
+        'download_latencies' (completion time per download ID, across runs)
+    """
+    runs: List[Dict[str, Any]] = []
+    open_runs: List[Dict[str, Any]] = []
+    unmarked: List[Dict[str, Any]] = []
+    download_latencies: Dict[str, float] = {}
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            event_type = event['type']
+
+            if event_type == 'run':
+                if event.get('phase') == 'start':
+                    run = {'label': event['label'], 'duration': None, 'events': []}
+                    runs.append(run)
+                    open_runs.append(run)
+                elif event.get('phase') == 'end':
+                    for run in reversed(open_runs):
+                        if run['label'] == event['label']:
+                            run['duration'] = event['latency']
+                            open_runs.remove(run)
+                            break
+
+            # Downloads can complete after their run ended
+            elif event_type == 'download':
+                download_latencies[event['download_id']] = event['latency']
+
+            else:
+                (open_runs[-1]['events'] if open_runs else unmarked).append(event)
+
+    if not runs and unmarked:
+        runs.append({'label': 'trace', 'duration': None, 'events': unmarked})
+
+    return {'runs': runs, 'download_latencies': download_latencies}
+
+def load_trace(path: str, run_index: int = -1) -> Dict[str, Any]:
+    """
+    Turn one recorded run of a trace into per-channel work profiles
+
+    Args:
+        path (str): Trace file written with TRACE_RECORD_PATH
+        run_index (int): Position of the run to replay among the recorded runs,
+            negative counts from the end (the latest by default)
+
+    Returns:
+        Dict: 'channels' (profiles in recorded order), 'runs' (recorded runs)
+        and 'run' (the replayed one, None if the trace has no runs)
+    """
+    trace = split_runs(path)
+    runs = trace['runs']
+    download_latencies = trace['download_latencies']
+
+    if not runs:
+        return {'channels': [], 'runs': runs, 'run': None}
+
+    run = runs[run_index]
+    channels: Dict[str, Dict[str, Any]] = {}
+
+    def profile(key):
+        return channels.setdefault(key, {
+            'key': key,
+            'user_ids': [],
+            'listing': [],
+            'metadata': [],
+            'submits': [],
+            'recorded_latency': None
+        })
+
+    for event in run['events']:
+        event_type = event['type']
+
+        if event_type == 'channel':
+            channel = profile(event['key'])
+            channel['user_ids'] = [str(user_id) for user_id in event['user_ids']]
+            channel['recorded_latency'] = event['latency']
+
+        elif event_type == 'ytdlp' and event.get('channel'):
+            calls = profile(event['channel'])['listing' if '--flat-playlist' in event['args'] else 'metadata']
+            calls.append(event['latency'])
+
+        elif event_type == 'api' and event.get('channel') and event['method'] == 'POST' and event['path'] == '/download/video':
+            download_id = None
+            try:
+                download_id = json.loads(event['body'] or '{}').get('downloadId')
+            except ValueError:
+                pass
+            profile(event['channel'])['submits'].append({'latency': event['latency'], 'download_id': download_id})
+
+    # Downloads the run stopped tracking take the median recorded completion time
+    completed = sorted(download_latencies.values())
+    median_download = completed[len(completed) // 2] if completed else 0.0
+
+    for channel in channels.values():
+        for submit in channel['submits']:
+            submit['download_latency'] = download_latencies.get(submit['download_id'], median_download)
+
+    return {
+        'channels': [channel for channel in channels.values() if channel['recorded_latency'] is not None],
+        'runs': runs,
+        'run': run
+    }
+
+def scale_channels(channels: List[Dict[str, Any]], scale: int) -> List[Dict[str, Any]]:
+    """
+    Replicate the recorded channels, each copy owned by copies of its users
+
+    Args:
+        channels (List[Dict]): Channel profiles
+        scale (int): Number of copies
+
+    Returns:
+        List[Dict]: Scaled channel profiles
+    """
+    if scale <= 1:
+        return channels
+
+    return [
+        {**channel, 'key': f"{channel['key']}#{copy}", 'user_ids': [f"{user_id}#{copy}" for user_id in channel['user_ids']]}
+        for copy in range(scale)
+        for channel in channels
+    ]
+
+def estimated_cost(channel: Dict[str, Any]) -> float:
+    """Serial seconds of work a channel profile represents"""
+    return sum(channel['listing']) + sum(channel['metadata']) + sum(submit['latency'] for submit in channel['submits'])
+
+def simulate(channels: List[Dict[str, Any]], channel_workers: int, ytdlp_concurrency: int, metadata_batch: int,
+             download_depth: int, policy: str) -> Dict[str, Any]:
+    """
+    Replay channel profiles under one deployment configuration
+
+    Mirrors ChannelTracker: workers take channels by policy, each channel lists
+    its videos, fetches metadata in batches, and submits downloads, waiting for
+    a free download slot. A slot frees up when the backend completes the download.
+
+    Args:
+        channels (List[Dict]): Channel profiles from load_trace()
+        channel_workers (int): CHANNEL_WORKERS
+        ytdlp_concurrency (int): yt-dlp processes allowed at once
+        metadata_batch (int): Metadata fetches started together per channel
+        download_depth (int): DOWNLOAD_QUEUE_DEPTH
+        policy (str): 'fifo', 'fair' or 'longest-first'
+
+    Returns:
+        Dict: Projected duration, per-user finish times and resource use
+    """
+    simulation = Simulation()
+    ytdlp = Resource(simulation, 'yt-dlp', ytdlp_concurrency)
+    downloads = Resource(simulation, 'download slots', download_depth)
+    workers = Resource(simulation, 'channel workers', channel_workers)
+
+    user_finished_at: Dict[str, float] = {}
+    channels_done_at = [0.0]
+
+    def ytdlp_call(latency):
+        yield 'acquire', ytdlp
+        yield 'delay', latency
+        yield 'release', ytdlp
+
+    def backend_download(latency):
+        yield 'delay', latency
+        yield 'release', downloads
+
+    def channel_process(channel):
+        for latency in channel['listing']:
+            yield from ytdlp_call(latency)
+
+        for start in range(0, len(channel['metadata']), metadata_batch):
+            batch = channel['metadata'][start:start + metadata_batch]
+            yield 'all', [ytdlp_call(latency) for latency in batch]
+
+        for submit in channel['submits']:
+            yield 'acquire', downloads
+            yield 'delay', submit['latency']
+            simulation.start(backend_download(submit['download_latency']))
+
+    if policy == 'fair':
+        queue = FairShareQueue(config.get_user_share_weights(), config.USER_MAX_CONCURRENT_CHECKS)
+        for index, channel in enumerate(channels):
+            queue.push(index, channel, channel['user_ids'])
+        take_next = lambda: queue.pop()
+    else:
+        ordered = list(enumerate(channels))
+        if policy == 'longest-first':
+            ordered.sort(key=lambda item: estimated_cost(item[1]), reverse=True)
+        pending = deque(ordered)
+        queue = None
+        take_next = lambda: pending.popleft() if pending else None
+
+    def dispatch():
+        while workers.in_use < workers.capacity:
+            next_channel = take_next()
+            if next_channel is None:
+                return
+            index, channel = next_channel
+            workers.request(lambda: None)
+            started_at = simulation.now
+
+            def on_done(index=index, channel=channel, started_at=started_at):
+                if queue is not None:
+                    queue.complete(index, simulation.now - started_at)
+                for user_id in channel['user_ids']:
+                    user_finished_at[user_id] = max(user_finished_at.get(user_id, 0.0), simulation.now)
+                channels_done_at[0] = max(channels_done_at[0], simulation.now)
+                workers.release()
+                dispatch()
+
+            simulation.start(channel_process(channel), on_done)
+
+    dispatch()
+    simulation.run()
+
+    finish_times = sorted(user_finished_at.values())
+
+    def percentile(share):
+        return finish_times[min(len(finish_times) - 1, int(len(finish_times) * share))] if finish_times else 0.0
+
+    return {
+        'duration': simulation.now,
+        'channels_duration': channels_done_at[0],
+        'user_finish_p50': percentile(0.5),
+        'user_finish_p95': percentile(0.95),
+        'resources': {
+            resource.name: {'utilization': resource.utilization(), 'peak': resource.peak}
+            for resource in (workers, ytdlp, downloads)
+        },
+        'ytdlp_calls': sum(len(channel['listing']) + len(channel['metadata']) for channel in channels),
+        'downloads': sum(len(channel['submits']) for channel in channels)
+    }
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as H:MM:SS"""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Project tracking run duration from a recorded trace')
+    parser.add_argument('trace', help='Trace file recorded with TRACE_RECORD_PATH')
+    parser.add_argument('--run', type=int, default=-1,
+                        help='Recorded run to replay, numbered as listed (negative counts from the end, default: latest)')
+    parser.add_argument('--scale', type=int, default=1, help='Replicate the recorded channels N times')
+    parser.add_argument('--channel-workers', type=int, nargs='+', default=[config.CHANNEL_WORKERS])
+    parser.add_argument('--ytdlp-concurrency', type=int, nargs='+', default=[config.METADATA_FETCH_WORKERS])
+    parser.add_argument('--metadata-batch', type=int, nargs='+', default=[config.METADATA_FETCH_WORKERS])
+    parser.add_argument('--download-depth', type=int, nargs='+', default=[config.DOWNLOAD_QUEUE_DEPTH])
+    parser.add_argument('--policy', choices=POLICIES, nargs='+', default=['fair'])
+
+    args = parser.parse_args()
+
+    try:
+        trace = load_trace(args.trace, args.run - 1 if args.run > 0 else args.run)
+    except IndexError:
+        print(f"❌ No run {args.run} in trace")
+        sys.exit(1)
+
+    if not trace['channels']:
+        print("❌ No channel events in trace; record a run with TRACE_RECORD_PATH set")
+        sys.exit(1)
+
+    channels = scale_channels(trace['channels'], args.scale)
+
+    print(f"\n🧪 Capacity simulation: {len(trace['channels'])} recorded channels x {args.scale} = {len(channels)}")
+    for number, run in enumerate(trace['runs'], 1):
+        duration = format_duration(run['duration']) if run['duration'] is not None else 'unfinished'
+        marker = '  <- replayed' if run is trace['run'] else ''
+        print(f"   {number}. Recorded {run['label']}: {duration}{marker}")
+
+    print("-" * 112)
+    print(f"{'Policy':<14}{'Workers':>8}{'yt-dlp':>8}{'Batch':>7}{'DL depth':>9}{'Duration':>11}"
+          f"{'User p50':>10}{'User p95':>10}{'Workers%':>10}{'yt-dlp%':>9}{'yt-dlp peak':>12}")
+
+    for policy, workers, ytdlp_concurrency, batch, depth in itertools.product(
+        args.policy, args.channel_workers, args.ytdlp_concurrency, args.metadata_batch, args.download_depth
+    ):
+        result = simulate(channels, workers, ytdlp_concurrency, batch, depth, policy)
+        resources = result['resources']
+        print(
+            f"{policy:<14}{workers:>8}{ytdlp_concurrency:>8}{batch:>7}{depth:>9}"
+            f"{format_duration(result['duration']):>11}"
+            f"{format_duration(result['user_finish_p50']):>10}{format_duration(result['user_finish_p95']):>10}"
+            f"{resources['channel workers']['utilization']:>10.0%}{resources['yt-dlp']['utilization']:>9.0%}"
+            f"{resources['yt-dlp']['peak']:>12}"
+        )
+
+    print(f"\n📦 Per configuration: {result['ytdlp_calls']} yt-dlp calls, {result['downloads']} downloads")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Trace Recording Module for XandTube Channel Tracking Jobs
+Records yt-dlp outputs, API responses and per-call latencies of real runs for simulator.py
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+from config import config
+
+class TraceRecorder:
+    """Appends timestamped call events to a JSON lines file, tagged with the channel being processed"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): Trace file to append to; recording is off without one
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.file = None
+        self.started_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def current_channel(self) -> Optional[str]:
+        """Channel group key the calling thread is working on"""
+        return getattr(self.local, 'channel', None)
+
+    @contextmanager
+    def channel(self, key: str):
+        """Tag events recorded by this thread with a channel group key"""
+        previous = self.current_channel()
+        self.local.channel = key
+        try:
+            yield
+        finally:
+            self.local.channel = previous
+
+    def bind(self, func: Callable) -> Callable:
+        """
+        Carry the caller's channel tag into a worker thread
+
+        Args:
+            func (Callable): Function that will run in another thread
+
+        Returns:
+            Callable: Wrapper running func under the caller's channel tag
+        """
+        if not self.enabled:
+            return func
+
+        key = self.current_channel()
+
+        def bound(*args, **kwargs):
+            with self.channel(key):
+                return func(*args, **kwargs)
+
+        return bound
+
+    def record(self, event_type: str, **fields: Any):
+        """
+        Append an event to the trace
+
+        Args:
+            event_type (str): 'run', 'channel', 'ytdlp', 'api' or 'download'
+            **fields: Event details (latency in seconds, outputs, ...)
+        """
+        if not self.enabled:
+            return
+
+        entry = {
+            'type': event_type,
+            'time': round(time.monotonic() - self.started_at, 4),
+            'channel': self.current_channel(),
+            **fields
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+
+        with self.lock:
+            if self.file is None:
+                trace_dir = os.path.dirname(self.path)
+                if trace_dir:
+                    os.makedirs(trace_dir, exist_ok=True)
+                self.file = open(self.path, 'a', encoding='utf-8')
+
+            self.file.write(line + '\n')
+            self.file.flush()
+
+# Process-wide recorder, enabled by TRACE_RECORD_PATH
+recorder = TraceRecorder(config.TRACE_RECORD_PATH)
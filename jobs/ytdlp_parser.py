@@ -0,0 +1,197 @@
+"""
+yt-dlp Output Parsing Module for XandTube Channel Tracking Jobs
+Decodes and normalizes yt-dlp JSON output, optionally in a process pool so parsing doesn't hold the GIL
+"""
+
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Compact listing entry: (id, title or None, url)
+ListingEntry = Tuple[str, Optional[str], str]
+
+def parse_listing_lines(lines: List[str]) -> Tuple[List[ListingEntry], List[str]]:
+    """
+    Decode flat-playlist output lines into compact entries
+
+    Module-level so the process pool can pickle it.
+
+    Args:
+        lines (List[str]): Lines of `yt-dlp --dump-json --flat-playlist` output
+
+    Returns:
+        Tuple[List[ListingEntry], List[str]]: Video entries and decode errors
+    """
+    entries = []
+    errors = []
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            entry = loads(line)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+
+        # Skip playlist metadata, only keep video entries
+        if entry.get('_type') == 'playlist' or not entry.get('id'):
+            continue
+
+        entries.append((
+            entry['id'],
+            entry.get('title') or None,
+            entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
+        ))
+
+    return entries, errors
+
+def normalize_video_metadata(output: str, video_url: str) -> Dict[str, Any]:
+    """
+    Decode `yt-dlp --dump-json` output for one video into the fields the tracker uses
+
+    Module-level so the process pool can pickle it. Large fields the tracker
+    ignores (formats, thumbnails list, ...) never leave the worker process.
+
+    Args:
+        output (str): yt-dlp output
+        video_url (str): URL the metadata was requested for
+
+    Returns:
+        Dict: Video information
+    """
+    video_data = loads(output)
+
+    return {
+        'id': video_data['id'],
+        'title': video_data.get('title', ''),
+        'url': video_data.get('webpage_url') or video_url,
+        'upload_date': video_data.get('upload_date'),
+        'duration': video_data.get('duration') or 0,
+        'thumbnail': video_data.get('thumbnail', ''),
+        'description': video_data.get('description', ''),
+        'view_count': video_data.get('view_count') or 0,
+        'uploader': video_data.get('uploader', ''),
+        'channel_id': video_data.get('channel_id', ''),
+        'webpage_url': video_data.get('webpage_url', ''),
+        'tags': video_data.get('tags') or []
+    }
+
+# Shared parsing pool, created on first use when PARSE_PROCESS_POOL_ENABLED
+pool: Optional[ProcessPoolExecutor] = None
+pool_lock = threading.Lock()
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the parsing pool, creating it on first use
+
+    Returns:
+        ProcessPoolExecutor: The pool, or None when process parsing is disabled
+    """
+    global pool
+
+    if not config.PARSE_PROCESS_POOL_ENABLED:
+        return None
+
+    with pool_lock:
+        if pool is None:
+            # spawn: forking a process that runs threads can copy held locks
+            pool = ProcessPoolExecutor(
+                max_workers=config.PARSE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"🧵 Started yt-dlp parsing pool with {config.PARSE_POOL_WORKERS} processes")
+        return pool
+
+def disable_pool(error: Exception):
+    """Fall back to parsing in-thread after the pool broke"""
+    global pool
+
+    logger.warning(f"⚠️ yt-dlp parsing pool failed, parsing in-thread from now on: {error}")
+    with pool_lock:
+        if pool is not None:
+            pool.shutdown(wait=False)
+        pool = None
+        config.PARSE_PROCESS_POOL_ENABLED = False
+
+def parse_listing(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse flat-playlist output into video entries
+
+    Outputs of PARSE_POOL_MIN_LINES lines or more are decoded in the process
+    pool, in chunks of PARSE_POOL_CHUNK_LINES, when it is enabled.
+
+    Args:
+        output (str): yt-dlp output
+
+    Returns:
+        List[Dict]: Video entries (id, title, url), in output order
+    """
+    lines = output.splitlines()
+    executor = get_pool() if len(lines) >= config.PARSE_POOL_MIN_LINES else None
+    results = None
+
+    if executor is not None:
+        chunk_size = config.PARSE_POOL_CHUNK_LINES
+        try:
+            results = list(executor.map(
+                parse_listing_lines,
+                [lines[start:start + chunk_size] for start in range(0, len(lines), chunk_size)]
+            ))
+        except (BrokenProcessPool, OSError) as e:
+            disable_pool(e)
+
+    if results is None:
+        results = [parse_listing_lines(lines)]
+
+    entries = []
+
+    for chunk_entries, errors in results:
+        for error in errors:
+            logger.warning(f"⚠️ Failed to parse JSON line: {error}")
+
+        for video_id, title, url in chunk_entries:
+            entries.append({
+                'id': video_id,
+                'title': title or f"Video {len(entries) + 1}",
+                'url': url
+            })
+
+    return entries
+
+def parse_video_metadata(output: str, video_url: str) -> Dict[str, Any]:
+    """
+    Parse full metadata output for one video, in the process pool when enabled
+
+    Args:
+        output (str): yt-dlp output
+        video_url (str): URL the metadata was requested for
+
+    Returns:
+        Dict: Video information
+    """
+    executor = get_pool()
+
+    if executor is not None:
+        try:
+            return executor.submit(normalize_video_metadata, output, video_url).result()
+        except (BrokenProcessPool, OSError) as e:
+            disable_pool(e)
+
+    return normalize_video_metadata(output, video_url)